@@ -0,0 +1,61 @@
+"""
+Benchmark of the backtest engine in prototype_data/backtest.py.
+
+Builds a synthetic feature history (daily or hourly rows over several years), scales
+it with feature_scaler.pkl and backtests btc_gru_model.h5 on every window, printing
+the time taken and the resulting hit rate.
+
+Usage:
+    python benchmarks/bench_backtest.py [--years 5] [--hourly] [--backend numpy|keras] [--time-steps 2]
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.backtest import backtest
+from prototype_data.numpy_gru import NumpyGRUModel
+
+PROTOTYPE_DIR = os.path.join(os.path.dirname(__file__), '..', 'prototype_data')
+
+
+def make_history(rows, scaler, seed=0):
+    """Draws feature rows around the scaler's mean and spread."""
+    rng = np.random.default_rng(seed)
+    values = scaler.mean_ + rng.standard_normal((rows, len(scaler.mean_))) * scaler.scale_
+    return pd.DataFrame(values, columns=scaler.feature_names_in_)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--hourly', action='store_true')
+    parser.add_argument('--backend', choices=['numpy', 'keras'], default='numpy')
+    parser.add_argument('--time-steps', type=int, default=2)
+    args = parser.parse_args()
+
+    scaler = joblib.load(os.path.join(PROTOTYPE_DIR, 'feature_scaler.pkl'))
+    model_path = os.path.join(PROTOTYPE_DIR, 'btc_gru_model.h5')
+    if args.backend == 'keras':
+        from tensorflow.keras.models import load_model
+        model = load_model(model_path)
+    else:
+        model = NumpyGRUModel(model_path)
+
+    rows = args.years * 365 * (24 if args.hourly else 1)
+    history = make_history(rows, scaler)
+    start = time.perf_counter()
+    summary, _ = backtest(history, model, scaler, time_steps=args.time_steps)
+    elapsed = time.perf_counter() - start
+    print(f"{summary['windows']} windows ({'hourly' if args.hourly else 'daily'}, {args.years} years, "
+          f"{args.backend}) in {elapsed:.3f}s, hit rate {summary['hit_rate']:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark of the daily Reddit aggregation in prototype_data/predict.py.
+
+Compares aggregate_daily (integer date and sentiment codes, bincount and built-in
+reductions) with the previous lambda-based groupby on synthetic pre-scored posts,
+checks that both give identical output, and prints timings for 1k to 1M posts.
+Each path gets the Sentiment column the way its pipeline stores it: string labels
+for the lambda version, SENTIMENT_CLASSES categories for aggregate_daily.
+
+Usage:
+    python benchmarks/bench_daily_aggregation.py [--sizes 1000 10000 100000 1000000] [--days 30]
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.predict import aggregate_daily, SENTIMENT_CLASSES
+
+
+def lambda_aggregate(recent_data):
+    """The aggregation preprocess_reddit_only used before aggregate_daily."""
+    return recent_data.groupby('Date').agg(
+        total_score=('Score', 'sum'),
+        total_comments=('Comments', 'sum'),
+        average_upvote_ratio=('Upvote Ratio', 'mean'),
+        total_posts=('ID', 'count'),
+        percentage_negative=('Sentiment', lambda x: (x == 'negative').mean() * 100),
+        percentage_neutral=('Sentiment', lambda x: (x == 'neutral').mean() * 100),
+        percentage_positive=('Sentiment', lambda x: (x == 'positive').mean() * 100)
+    ).reset_index()
+
+
+def make_posts(num_posts, num_days, seed=0):
+    """Builds posts with string Sentiment labels spread over `num_days` dates."""
+    rng = np.random.default_rng(seed)
+    start = datetime.date(2025, 1, 1)
+    dates = np.array([start + datetime.timedelta(days=i) for i in range(num_days)], dtype=object)
+    labels = np.array(SENTIMENT_CLASSES, dtype=object)
+    return pd.DataFrame({
+        'Date': dates[rng.integers(0, num_days, num_posts)],
+        'Score': rng.integers(0, 5000, num_posts),
+        'Comments': rng.integers(0, 500, num_posts),
+        'Upvote Ratio': rng.random(num_posts),
+        'ID': [f"p{i}" for i in range(num_posts)],
+        'Sentiment': labels[rng.integers(0, 3, num_posts)],
+    })
+
+
+def best_of(func, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'posts':>10} {'lambda (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for size in args.sizes:
+        posts = make_posts(size, args.days)
+        coded_posts = posts.assign(Sentiment=pd.Categorical(posts['Sentiment'], categories=SENTIMENT_CLASSES))
+        old_time, old_result = best_of(lambda_aggregate, posts, args.repeat)
+        new_time, new_result = best_of(aggregate_daily, coded_posts, args.repeat)
+        pd.testing.assert_frame_equal(old_result, new_result, check_exact=True)
+        print(f"{size:>10} {old_time:>12.4f} {new_time:>15.4f} {old_time / new_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
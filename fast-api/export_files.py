@@ -0,0 +1,197 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from prototype_data.predict import EXPORT_FORMATS, write_dataframe
+
+
+def csv_chunks(df, chunk_rows=1000):
+    """Yields a DataFrame as UTF-8 CSV, header first, `chunk_rows` rows at a time."""
+    yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode('utf-8')
+
+
+def prune_directory(directory, max_age=None, max_bytes=None, keep=()):
+    """
+    Applies the retention policy of an export directory.
+
+    Files older than `max_age` seconds are deleted, then the oldest remaining files
+    are deleted until the directory holds at most `max_bytes`. Paths in `keep` are
+    never deleted but still count towards the size budget.
+
+    Returns:
+        int: Number of files deleted.
+    """
+    if not os.path.isdir(directory):
+        return 0
+    files = []
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for mtime, size, path in files:
+        expired = max_age is not None and now - mtime > max_age
+        over_budget = max_bytes is not None and total > max_bytes
+        if (not expired and not over_budget) or path in keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+class ExportCache:
+    """
+    Content-addressed cache of rendered export files.
+
+    An export is identified by a hash of everything it is rendered from: the snapshot
+    version, the kind of export and its parameters (format, time steps, ...). The first
+    request renders the file once into `directory`; identical requests in the same data
+    window are then served straight from disk with a strong ETag (the SHA-256 of the
+    file). Files are evicted by age and total size with prune_directory.
+
+    get() and put() mark the returned file as in use until release() is called, and
+    prune() never deletes a file in use, so a file cannot disappear between being
+    looked up (or rendered) and being sent.
+
+    Args:
+        directory (str): Directory holding the rendered files.
+        max_age (float, optional): Seconds a rendered file is kept.
+        max_bytes (int, optional): Maximum total size of the directory.
+    """
+
+    def __init__(self, directory, max_age=None, max_bytes=None):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._etags = {}
+        self._in_use = Counter()
+        self._lock = threading.Lock()
+        # Held while pruning and while a lookup checks a file and marks it in use.
+        self._prune_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(version, kind, **params):
+        """Hashes the snapshot version, export kind and parameters into a cache key."""
+        payload = json.dumps({"version": version, "kind": kind, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def get(self, key, file_format):
+        """Returns (path, etag) of a rendered export that is still fresh, marked in use, or None."""
+        path = self._path(key, file_format)
+        with self._prune_lock:
+            try:
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:
+                with self._lock:
+                    self._etags.pop(path, None)
+                    self.stats["misses"] += 1
+                return None
+            if self.max_age is not None and time.time() - mtime > self.max_age:
+                with self._lock:
+                    self.stats["misses"] += 1
+                return None
+            with self._lock:
+                self._in_use[path] += 1
+                etag = self._etags.get(path)
+        if etag is None:
+            etag = _file_digest(path)
+            with self._lock:
+                self._etags[path] = etag
+        with self._lock:
+            self.stats["hits"] += 1
+        return path, etag
+
+    def put(self, key, df, file_format):
+        """Renders `df` in `file_format`, stores it under `key` and returns (path, etag), marked in use."""
+        path = self._path(key, file_format)
+        if file_format == 'csv':
+            chunks = csv_chunks(df)
+        else:
+            buffer = io.BytesIO()
+            write_dataframe(df, buffer, file_format)
+            chunks = [buffer.getvalue()]
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+            with self._prune_lock:
+                os.replace(temp_path, path)
+                with self._lock:
+                    self._in_use[path] += 1
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        etag = digest.hexdigest()[:32]
+        with self._lock:
+            self._etags[path] = etag
+        self.prune()
+        return path, etag
+
+    def release(self, path):
+        """Marks a file returned by get() or put() as no longer being served."""
+        with self._lock:
+            self._in_use[path] -= 1
+            if self._in_use[path] <= 0:
+                del self._in_use[path]
+
+    def prune(self, *args):
+        """Evicts files not in use by age and total size. Extra arguments are ignored so it can be a snapshot listener."""
+        with self._prune_lock:
+            with self._lock:
+                keep = set(self._in_use)
+            removed = prune_directory(self.directory, max_age=self.max_age, max_bytes=self.max_bytes, keep=keep)
+        if removed:
+            with self._lock:
+                self._etags = {path: etag for path, etag in self._etags.items() if os.path.exists(path)}
+        return removed
+
+    def metrics(self):
+        with self._lock:
+            return dict(self.stats, files=len(self._etags), in_use=sum(self._in_use.values()))
+
+    def _path(self, key, file_format):
+        return os.path.join(self.directory, key + EXPORT_FORMATS[file_format][0])
+
+
+def etag_matches(if_none_match, etag):
+    """Checks an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires for GET)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+_STOP = object()
+
+
+class InferenceBatcher:
+    """
+    Micro-batching front end for a model's predict().
+
+    Callers use predict() exactly like the wrapped model's. Requests are queued and
+    a single worker thread collects them for at most `max_wait` seconds (or until
+    `max_batch_size` rows are waiting), runs one batched forward pass, and hands
+    every caller back its own rows. Only the worker thread ever touches the model,
+    so concurrent callers also stop contending for it.
+
+    Args:
+        model: Object with a Keras-style predict(x, verbose=0) method.
+        max_batch_size (int): Maximum number of rows per forward pass.
+        max_wait (float): Seconds the worker waits for more requests after the first.
+    """
+
+    def __init__(self, model, max_batch_size=32, max_wait=0.002):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._stats = {"requests": 0, "batches": 0, "errors": 0}
+        self._closed = False
+        # Guards _closed so no request can be queued behind _STOP.
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._worker.start()
+
+    def predict(self, x, verbose=0):
+        """Queues `x` for the next batch and blocks until its rows are predicted."""
+        request = _Request(np.asarray(x))
+        with self._submit_lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put(request)
+        if closed:
+            return self.model.predict(x, verbose=0)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def metrics(self):
+        """Returns request and batch counters plus the batch-size distribution (rows per forward pass)."""
+        with self._lock:
+            return dict(
+                self._stats,
+                max_batch_size=self.max_batch_size,
+                max_wait_ms=self.max_wait * 1000,
+                batch_sizes={str(size): count for size, count in sorted(self._batch_sizes.items())},
+            )
+
+    def shutdown(self):
+        """Stops the worker thread once the queued requests are served; later calls predict directly."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join(timeout=5)
+
+    def _run(self):
+        pending = None
+        while True:
+            first = pending or self._queue.get()
+            pending = None
+            if first is _STOP:
+                self._fail_remaining()
+                return
+            batch = [first]
+            rows = len(first.inputs)
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch_size:
+                try:
+                    request = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if (request is _STOP or rows + len(request.inputs) > self.max_batch_size
+                        or request.inputs.shape[1:] != first.inputs.shape[1:]):
+                    # Starts the next batch (or stops the worker after this one).
+                    pending = request
+                    break
+                batch.append(request)
+                rows += len(request.inputs)
+            self._serve(batch, rows)
+
+    def _fail_remaining(self):
+        # Nothing is queued after _STOP while _submit_lock is respected; never leave a caller waiting.
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not _STOP:
+                request.error = RuntimeError("Inference batcher was shut down before serving this request.")
+                request.done.set()
+
+    def _serve(self, batch, rows):
+        try:
+            outputs = self.model.predict(np.concatenate([request.inputs for request in batch]), verbose=0)
+        except Exception as e:
+            for request in batch:
+                request.error = e
+                request.done.set()
+            with self._lock:
+                self._stats["errors"] += 1
+            return
+        offset = 0
+        for request in batch:
+            request.result = outputs[offset:offset + len(request.inputs)]
+            offset += len(request.inputs)
+            request.done.set()
+        with self._lock:
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            self._batch_sizes[rows] += 1
+
+
+class _Request:
+    __slots__ = ('inputs', 'result', 'error', 'done')
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
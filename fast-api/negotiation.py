@@ -0,0 +1,209 @@
+import gzip
+import io
+import json
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from export_files import etag_matches
+from prototype_data.predict import arrow_table, write_dataframe
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+}
+# Bodies smaller than this are sent uncompressed; compression would not pay off.
+MIN_COMPRESS_BYTES = 1024
+VARY = "Accept, Accept-Encoding"
+
+
+def negotiated_response(request, data, headers=None):
+    """
+    Encodes tabular data in the format and compression the client asked for.
+
+    The body format follows the Accept header: JSON by default (orjson when installed),
+    columnar MessagePack ({column: [values]}), an Arrow IPC file or an Arrow IPC
+    stream. Formats whose optional package is not installed are skipped. The body is
+    then brotli- or gzip-compressed according to Accept-Encoding.
+
+    Args:
+        request (Request): Incoming request.
+        data (list or pd.DataFrame): Records (list of dicts) or a DataFrame.
+        headers (dict, optional): Extra response headers.
+
+    Returns:
+        Response
+    """
+    media_type = _choose(_parse_quality(request.headers.get("accept", "")), _available_media_types(), JSON_MEDIA_TYPE)
+    body = _encode(data, media_type)
+
+    headers = dict(headers or {})
+    headers["Vary"] = VARY
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = _choose(_parse_quality(request.headers.get("accept-encoding", "")), _available_encodings(), None)
+        if encoding == "br":
+            body = brotli.compress(body, quality=5)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def cache_headers(version, last_modified=None, max_age=0, stale_while_revalidate=0):
+    """
+    Builds the validator and freshness headers of a response derived from versioned data.
+
+    The ETag is weak because every negotiated format and encoding of the same version
+    shares it: they are different bytes of semantically equivalent content.
+
+    Args:
+        version (str): Version of the data the response is built from.
+        last_modified (datetime.datetime, optional): UTC time the data was fetched.
+        max_age (float): Seconds shared caches may serve the response without revalidating.
+        stale_while_revalidate (float): Extra seconds a stale response may be served
+            while the cache revalidates it in the background.
+
+    Returns:
+        dict: Response headers.
+    """
+    cache_control = f"public, max-age={int(max_age)}"
+    if stale_while_revalidate:
+        cache_control += f", stale-while-revalidate={int(stale_while_revalidate)}"
+    headers = {"ETag": f'W/"{version}"', "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def not_modified(request, headers):
+    """
+    Answers a conditional GET from the validators in `headers`.
+
+    If-None-Match takes precedence; If-Modified-Since is only used when the client sent
+    no entity tag.
+
+    Returns:
+        Response: A 304 Not Modified carrying `headers`, or None if the client's copy is outdated.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = headers.get("ETag")
+        if etag is not None and etag.startswith("W/"):
+            etag = etag[2:]
+        matched = etag is not None and etag_matches(if_none_match, etag.strip('"'))
+    else:
+        matched = _not_modified_since(request.headers.get("if-modified-since"), headers.get("Last-Modified"))
+    if not matched:
+        return None
+    return Response(status_code=304, headers=dict(headers, Vary=VARY))
+
+
+def _not_modified_since(if_modified_since, last_modified):
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def _available_media_types():
+    available = [JSON_MEDIA_TYPE]
+    if msgpack is not None:
+        available.append(MSGPACK_MEDIA_TYPE)
+    try:
+        import pyarrow  # noqa: F401
+        available.extend([ARROW_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE])
+    except ImportError:
+        pass
+    return available
+
+
+def _available_encodings():
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _parse_quality(header):
+    """Parses an Accept-style header into (value, q) pairs, best first."""
+    values = []
+    for index, part in enumerate(header.split(",")):
+        fields = [field.strip() for field in part.split(";")]
+        if not fields[0]:
+            continue
+        quality = 1.0
+        for field in fields[1:]:
+            if field.startswith("q="):
+                try:
+                    quality = float(field[2:])
+                except ValueError:
+                    quality = 0.0
+        values.append((-quality, index, fields[0].lower()))
+    return [(value, -quality) for quality, _, value in sorted(values)]
+
+
+def _choose(preferences, available, default):
+    for value, quality in preferences:
+        if quality <= 0:
+            continue
+        value = MEDIA_TYPE_ALIASES.get(value, value)
+        if value in available:
+            return value
+        if value in ("*/*", "application/*", "*"):
+            return default if default is not None else available[0]
+    return default
+
+
+def _encode(data, media_type):
+    if media_type == ARROW_MEDIA_TYPE:
+        buffer = io.BytesIO()
+        write_dataframe(_frame(data), buffer, 'arrow')
+        return buffer.getvalue()
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        import pyarrow as pa
+        table = arrow_table(_frame(data))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        frame = _frame(data)
+        columns = {column: [_plain(value) for value in frame[column].tolist()] for column in frame.columns}
+        return msgpack.packb(columns)
+    records = data.to_dict(orient='records') if isinstance(data, pd.DataFrame) else data
+    if orjson is not None:
+        return orjson.dumps(records, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(jsonable_encoder(records), separators=(",", ":")).encode("utf-8")
+
+
+def _frame(data):
+    return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+
+def _plain(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+
+COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+
+
+class PriceClient:
+    """
+    Non-blocking client for price sources (CoinGecko-compatible API).
+
+    A single pooled `httpx.AsyncClient` keeps connections alive between calls,
+    every request carries a timeout, and a semaphore bounds how many requests
+    may be in flight at once.
+
+    Args:
+        base_url (str): Root URL of the price API. Point it at a local stand-in server for testing.
+        timeout (float): Default per-call timeout in seconds.
+        max_connections (int): Size of the connection pool.
+        max_concurrency (int): Maximum number of concurrent requests.
+    """
+
+    def __init__(self, base_url=COINGECKO_BASE_URL, timeout=10.0, max_connections=10, max_concurrency=4):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def get_json(self, path, params=None, timeout=None):
+        """
+        Sends a GET request and returns the decoded JSON body.
+
+        Raises:
+            httpx.HTTPStatusError: If the source answers with a non-2xx status.
+            httpx.TimeoutException: If the call exceeds its timeout.
+        """
+        async with self._semaphore:
+            response = await self._get_client().get(
+                path,
+                params=params,
+                timeout=self.timeout if timeout is None else timeout,
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def market_chart(self, coin_id="bitcoin", vs_currency="usd", days=30, timeout=None):
+        """Returns the `prices` series of /coins/{coin_id}/market_chart as [timestamp_ms, price] pairs."""
+        data = await self.get_json(
+            f"/coins/{coin_id}/market_chart",
+            params={"vs_currency": vs_currency, "days": str(days)},
+            timeout=timeout,
+        )
+        return data["prices"]
+
+    async def market_chart_range(self, from_timestamp, to_timestamp, coin_id="bitcoin", vs_currency="usd", timeout=None):
+        """
+        Returns the `prices` series of /coins/{coin_id}/market_chart/range between two UNIX
+        timestamps (seconds), used to fetch only the tail missing from the local store.
+        """
+        data = await self.get_json(
+            f"/coins/{coin_id}/market_chart/range",
+            params={"vs_currency": vs_currency, "from": str(int(from_timestamp)), "to": str(int(to_timestamp))},
+            timeout=timeout,
+        )
+        return data["prices"]
+
+    async def aclose(self):
+        """Closes the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
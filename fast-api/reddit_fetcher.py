@@ -0,0 +1,237 @@
+import asyncio
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FetchQueueFull(Exception):
+    """Raised when the Reddit fetch queue has no room for another crawl."""
+
+
+class RedditFetcher:
+    """
+    Runs PRAW crawls in a dedicated worker pool so they never block the event loop.
+
+    Each worker thread keeps its own `praw.Reddit` instance (PRAW is not thread-safe).
+    At most `max_workers` crawls run at once and at most `max_queue` more may wait;
+    further submissions raise FetchQueueFull instead of piling up.
+
+    In incremental mode the fetcher remembers the newest window of posts it has seen
+    and stops paging as soon as it reaches a known submission, merging only the new
+    posts into the window. A full crawl still runs when the window is too small for
+    the requested limit or after `full_refresh_interval` seconds, so scores and
+    comment counts of older posts do not go stale forever.
+
+    Args:
+        client_id (str): Reddit API client id.
+        client_secret (str): Reddit API client secret.
+        user_agent (str): User agent sent to Reddit.
+        subreddit_name (str): Subreddit to crawl. Defaults to "bitcoin".
+        max_workers (int): Number of crawl threads.
+        max_queue (int): Number of crawls allowed to wait for a free worker.
+        incremental (bool): Only fetch posts newer than the last seen one. Defaults to True.
+        full_refresh_interval (float): Seconds after which an incremental fetch falls back
+            to a full crawl.
+    """
+
+    def __init__(self, client_id, client_secret, user_agent, subreddit_name="bitcoin", max_workers=1, max_queue=4,
+                 incremental=True, full_refresh_interval=3600):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.user_agent = user_agent
+        self.subreddit_name = subreddit_name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.incremental = incremental
+        self.full_refresh_interval = full_refresh_interval
+        self._window = []
+        self._newest_created_utc = None
+        self._last_full_crawl = None
+        self._state_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reddit-fetch")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._stats = {
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "last_duration": None,
+            "total_duration": 0.0,
+            "max_duration": 0.0,
+            "last_post_count": 0,
+            "last_new_posts": 0,
+            "full_crawls": 0,
+            "incremental_crawls": 0,
+        }
+
+    async def fetch(self, limit, incremental=None):
+        """
+        Crawls the newest `limit` posts on a worker thread.
+
+        Args:
+            limit (int): Number of posts to return.
+            incremental (bool, optional): Overrides the fetcher's incremental setting.
+
+        Returns:
+            list: Post dicts, newest first.
+
+        Raises:
+            FetchQueueFull: If every worker is busy and the wait queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                raise FetchQueueFull(f"Reddit fetch queue is full ({self._pending} crawls pending).")
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if incremental is None:
+                incremental = self.incremental
+            return await loop.run_in_executor(self._executor, self._timed_crawl, limit, incremental)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def metrics(self):
+        """Returns queue depth and crawl duration statistics."""
+        with self._lock:
+            completed = self._stats["completed"]
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": completed,
+                "failed": self._stats["failed"],
+                "rejected": self._stats["rejected"],
+                "last_duration": self._stats["last_duration"],
+                "average_duration": self._stats["total_duration"] / completed if completed else None,
+                "max_duration": self._stats["max_duration"],
+                "last_post_count": self._stats["last_post_count"],
+                "last_new_posts": self._stats["last_new_posts"],
+                "full_crawls": self._stats["full_crawls"],
+                "incremental_crawls": self._stats["incremental_crawls"],
+            }
+
+    def seed(self, posts, newest_created_utc):
+        """
+        Primes the incremental window, e.g. from a persistent store after a restart,
+        so the next fetch only pulls posts newer than `newest_created_utc`.
+        """
+        if not posts or newest_created_utc is None:
+            return
+        with self._state_lock:
+            self._window = list(posts)
+            self._newest_created_utc = newest_created_utc
+            self._last_full_crawl = time.monotonic()
+
+    def shutdown(self):
+        """Stops the worker pool, dropping crawls that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_crawl(self, limit, incremental):
+        with self._lock:
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            if incremental and self._can_crawl_incrementally(limit):
+                data = self._crawl_incremental(limit)
+            else:
+                data = self._crawl(limit)
+        except Exception:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+        duration = time.perf_counter() - start
+        with self._lock:
+            self._stats["completed"] += 1
+            self._stats["last_duration"] = duration
+            self._stats["total_duration"] += duration
+            self._stats["max_duration"] = max(self._stats["max_duration"], duration)
+            self._stats["last_post_count"] = len(data)
+        return data
+
+    def _reddit(self):
+        reddit = getattr(self._local, "reddit", None)
+        if reddit is None:
+            # Imported on first crawl so that importing the API stays fast.
+            import praw
+            reddit = praw.Reddit(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                user_agent=self.user_agent
+            )
+            self._local.reddit = reddit
+        return reddit
+
+    def _can_crawl_incrementally(self, limit):
+        with self._state_lock:
+            if self._newest_created_utc is None or len(self._window) < limit:
+                return False
+            return time.monotonic() - self._last_full_crawl < self.full_refresh_interval
+
+    def _crawl(self, limit):
+        data = []
+        newest_created_utc = None
+        subreddit = self._reddit().subreddit(self.subreddit_name)
+        for submission in subreddit.new(limit=None):
+            if len(data) >= limit:
+                break
+            if newest_created_utc is None:
+                newest_created_utc = submission.created_utc
+            data.append(submission_to_post(submission))
+        with self._state_lock:
+            self._window = data
+            self._newest_created_utc = newest_created_utc
+            self._last_full_crawl = time.monotonic()
+        with self._lock:
+            self._stats["full_crawls"] += 1
+            self._stats["last_new_posts"] = len(data)
+        return list(data)
+
+    def _crawl_incremental(self, limit):
+        with self._state_lock:
+            known_ids = {post["id"] for post in self._window}
+            newest_created_utc = self._newest_created_utc
+        new_posts = []
+        new_newest = newest_created_utc
+        subreddit = self._reddit().subreddit(self.subreddit_name)
+        # Listings are paged lazily, so stopping at the first known post avoids
+        # requesting any page that only contains posts we already have.
+        for submission in subreddit.new(limit=None):
+            if len(new_posts) >= limit:
+                break
+            if submission.id in known_ids or submission.created_utc < newest_created_utc:
+                break
+            new_newest = max(new_newest, submission.created_utc)
+            new_posts.append(submission_to_post(submission))
+        with self._state_lock:
+            new_ids = {post["id"] for post in new_posts}
+            merged = new_posts + [post for post in self._window if post["id"] not in new_ids]
+            self._window = merged[:max(limit, len(self._window))]
+            self._newest_created_utc = new_newest
+            data = self._window[:limit]
+        with self._lock:
+            self._stats["incremental_crawls"] += 1
+            self._stats["last_new_posts"] = len(new_posts)
+        return list(data)
+
+
+def submission_to_post(submission):
+    """Converts a PRAW submission into the post dict served by the API."""
+    return {
+        "id": submission.id,
+        "time": datetime.datetime.fromtimestamp(submission.created_utc, tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        "url": submission.url,
+        "title": submission.title,
+        "upvote": submission.score,
+        "num_comments": submission.num_comments,
+        "text": submission.selftext,
+        "upvote_ratio": submission.upvote_ratio if hasattr(submission, 'upvote_ratio') else None,
+    }
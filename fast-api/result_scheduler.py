@@ -0,0 +1,123 @@
+import asyncio
+import datetime
+import time
+
+
+class PredictionScheduler:
+    """
+    Keeps the latest prediction in memory and recomputes it in the background.
+
+    The prediction is recomputed every `interval` seconds, and immediately whenever
+    trigger() is called (e.g. when a new snapshot lands). A recompute is skipped if
+    the snapshot version has not changed since the last successful one.
+
+    Args:
+        get_snapshot (callable): Coroutine function returning the current Snapshot.
+        compute (callable): Coroutine function taking a Snapshot and returning the
+            prediction as a dict.
+        interval (float): Seconds between scheduled recomputes.
+    """
+
+    def __init__(self, get_snapshot, compute, interval=300):
+        self.get_snapshot = get_snapshot
+        self.compute = compute
+        self.interval = interval
+        self._result = None
+        self._version = None
+        self._checked_at = None
+        self._last_error = None
+        self._inflight = None
+        self._task = None
+        self._wake = asyncio.Event()
+        self.stats = {"runs": 0, "skipped": 0, "errors": 0, "last_duration": None}
+
+    async def get(self):
+        """
+        Returns the latest prediction, computing it first if none exists yet.
+
+        Without the background loop (interval 0, or start() not called) every call
+        revalidates against the current snapshot; the recompute is skipped while the
+        snapshot version is unchanged.
+        """
+        if self._result is None or self._task is None:
+            return await self.refresh()
+        return self._result
+
+    async def refresh(self, force=False):
+        """Recomputes the prediction, joining a recompute that is already running."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._recompute(force))
+        return await asyncio.shield(self._inflight)
+
+    def trigger(self, *args):
+        """Wakes the scheduler so it recomputes without waiting for the interval."""
+        self._wake.set()
+
+    def start(self):
+        """Starts the background loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Cancels the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def version(self):
+        """Snapshot version of the served prediction, or None."""
+        return self._version
+
+    def freshness(self):
+        """Seconds until the served prediction is next checked against the snapshot (0 if none)."""
+        if self._checked_at is None:
+            return 0
+        return max(0.0, self.interval - (time.monotonic() - self._checked_at))
+
+    def status(self):
+        """Returns scheduler statistics and the version of the served prediction."""
+        return dict(self.stats, interval=self.interval, version=self._version, last_error=self._last_error)
+
+    async def _recompute(self, force):
+        try:
+            snapshot = await self.get_snapshot()
+            if not force and self._result is not None and snapshot.version == self._version:
+                self.stats["skipped"] += 1
+                self._checked_at = time.monotonic()
+                return self._result
+            start = time.perf_counter()
+            result = await self.compute(snapshot)
+            self.stats["runs"] += 1
+            self.stats["last_duration"] = time.perf_counter() - start
+            result["snapshot_time"] = snapshot.fetched_at.isoformat()
+            result["computed_at"] = datetime.datetime.now(tz=datetime.timezone.utc).isoformat()
+            self._result = result
+            self._version = snapshot.version
+            self._checked_at = time.monotonic()
+            self._last_error = None
+            return result
+        except Exception as e:
+            self.stats["errors"] += 1
+            self._last_error = str(e)
+            raise
+        finally:
+            self._inflight = None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: scheduled prediction refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
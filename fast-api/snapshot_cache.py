@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import time
+
+
+class Snapshot:
+    """
+    One consistent view of the upstream data shared by every endpoint.
+
+    Attributes:
+        reddit (list): Raw Reddit posts, newest first.
+        bitcoin (list): Bitcoin price points as {"date", "price"} dicts.
+        fetched_at (datetime.datetime): UTC time the snapshot was fetched.
+        version (str): Content digest of the snapshot, stable across processes.
+    """
+
+    def __init__(self, reddit, bitcoin, fetched_at=None):
+        self.reddit = reddit
+        self.bitcoin = bitcoin
+        self.fetched_at = fetched_at or datetime.datetime.now(tz=datetime.timezone.utc)
+        self.version = compute_version(reddit, bitcoin)
+
+
+def compute_version(reddit, bitcoin):
+    """Returns a short content digest for the given Reddit posts and price points."""
+    payload = json.dumps([reddit, bitcoin], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class SnapshotCache:
+    """
+    Process-wide snapshot cache with TTL, stale-while-revalidate and single-flight loading.
+
+    - A snapshot younger than `ttl` seconds is served as-is.
+    - A snapshot older than `ttl` but younger than `ttl + stale_ttl` is served immediately
+      while one background refresh runs.
+    - Anything older (or no snapshot at all) makes the caller wait for a refresh.
+    Concurrent callers always share the same in-flight load.
+
+    Args:
+        loader (callable): Coroutine function returning a Snapshot.
+        ttl (float): Seconds a snapshot is considered fresh.
+        stale_ttl (float): Extra seconds a stale snapshot may be served while revalidating.
+        clock (callable): Returns the current time in seconds. Defaults to time.monotonic.
+    """
+
+    def __init__(self, loader, ttl=300, stale_ttl=600, clock=time.monotonic):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._snapshot = None
+        self._loaded_at = None
+        self._inflight = None
+        self._listeners = []
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "loads": 0, "load_errors": 0}
+
+    @property
+    def snapshot(self):
+        """The current snapshot, or None if nothing has been loaded yet."""
+        return self._snapshot
+
+    def age(self):
+        """Seconds since the current snapshot was loaded, or None."""
+        if self._loaded_at is None:
+            return None
+        return self.clock() - self._loaded_at
+
+    def freshness(self):
+        """Seconds the current snapshot stays fresh before it is revalidated (0 if none)."""
+        age = self.age()
+        if age is None:
+            return 0
+        return max(0.0, self.ttl - age)
+
+    async def get(self):
+        """Returns a snapshot, loading or revalidating it as required."""
+        age = self.age()
+        if age is not None and age < self.ttl:
+            self.stats["hits"] += 1
+            return self._snapshot
+        if age is not None and age < self.ttl + self.stale_ttl:
+            self.stats["stale_hits"] += 1
+            self._start_refresh()
+            return self._snapshot
+        self.stats["misses"] += 1
+        return await self.refresh()
+
+    async def refresh(self):
+        """Forces a reload, joining the in-flight one if a load is already running."""
+        return await asyncio.shield(self._start_refresh())
+
+    def subscribe(self, callback):
+        """
+        Registers callback(snapshot), called every time a new snapshot is loaded.
+
+        Callbacks run on the event loop and must return quickly; blocking work should be
+        handed to an executor. Exceptions are printed and otherwise ignored.
+        """
+        self._listeners.append(callback)
+
+    def invalidate(self):
+        """Drops the current snapshot so the next get() waits for fresh data."""
+        self._snapshot = None
+        self._loaded_at = None
+
+    def _start_refresh(self):
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._load())
+            self._inflight.add_done_callback(_report_failure)
+        return self._inflight
+
+    async def _load(self):
+        try:
+            self.stats["loads"] += 1
+            snapshot = await self.loader()
+            self._snapshot = snapshot
+            self._loaded_at = self.clock()
+            for callback in self._listeners:
+                # The snapshot is already installed; a failing listener must not fail the load.
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    print(f"Warning: snapshot listener {getattr(callback, '__qualname__', callback)} failed: {e}")
+            return snapshot
+        except Exception:
+            self.stats["load_errors"] += 1
+            raise
+        finally:
+            self._inflight = None
+
+
+def _report_failure(future):
+    # Background revalidations have no awaiting caller, so surface their errors here.
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Warning: snapshot refresh failed: {future.exception()}")
@@ -0,0 +1,48 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupReport:
+    """
+    Records how long each import and initialization step of the API takes.
+
+    Steps are timed with `with report.step("name"):` blocks, in the order they run,
+    whether that is at module import (eager startup) or in the lifespan hook (lazy
+    startup). `mark_ready` records the time from process start until the app
+    accepts requests.
+
+    Args:
+        mode (str): Startup mode being reported, e.g. "eager" or "lazy".
+    """
+
+    def __init__(self, mode="eager"):
+        self.mode = mode
+        self.steps = []
+        self.ready = False
+        self.seconds_to_ready = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.steps.append({"name": name, "seconds": round(time.perf_counter() - start, 4)})
+
+    def mark_ready(self):
+        self.ready = True
+        self.seconds_to_ready = round(time.perf_counter() - self._started, 4)
+
+    def as_dict(self):
+        with self._lock:
+            steps = list(self.steps)
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "seconds_to_ready": self.seconds_to_ready,
+            "steps": steps,
+        }
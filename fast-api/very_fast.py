@@ -1,28 +1,142 @@
+import asyncio
 import sys
 import os
 import datetime
-import requests
-import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from startup_report import StartupReport
+
+startup = StartupReport()
 
 import uvicorn
-import praw
-import nltk
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import FileResponse
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from fastapi import FastAPI, Query, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
+from pydantic import BaseModel
+from typing import List, Optional
 
-from prototype_data.predict import preprocess_reddit_data, predict_next_day, export_preprocessed_data, export_reddit_data, export_bitcoin_data, preprocess_reddit_only
-from tensorflow.keras.models import load_model
-import pandas as pd
-import joblib
+with startup.step("import prototype_data (pandas, numpy, h5py)"):
+    from prototype_data.post_store import PostStore
+    from prototype_data.price_store import PriceStore
+    from prototype_data.daily_index import DailyAggregateIndex
+    from prototype_data.predict import preprocess_reddit_data, predict_next_day, preprocess_reddit_only
+    from prototype_data.predict import sentiment_label, score_sentiments, polarity_scores_many, get_sentiment_analyzer
+    from prototype_data.predict import configure_parallel_sentiment, shutdown_sentiment_pool, update_daily_index, EXPORT_FORMATS
+    from prototype_data.sentiment_cache import SentimentCache
+    from prototype_data.numpy_gru import load_guarded_model
+    from prototype_data.backtest import build_feature_history, backtest, sliding_windows
+    from prototype_data.prediction_cache import PredictionCache, file_version
+    from prototype_data.affine_scaler import load_scaler
+    import pandas as pd
+
+from snapshot_cache import Snapshot, SnapshotCache
+from price_client import PriceClient, COINGECKO_BASE_URL
+from reddit_fetcher import RedditFetcher, FetchQueueFull
+from result_scheduler import PredictionScheduler
+from inference_batcher import InferenceBatcher
+from export_files import ExportCache, etag_matches
+from negotiation import cache_headers, negotiated_response, not_modified
 
 load_dotenv()
 
-app = FastAPI()
+# "eager" loads the model, scaler and sentiment analyzer at import; "lazy" defers them
+# to the lifespan hook (or first use) so importing the module and --reload stay fast.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager")
+startup.mode = STARTUP_MODE
+
+price_client = PriceClient(
+    base_url=os.getenv("COINGECKO_BASE_URL", COINGECKO_BASE_URL),
+    timeout=float(os.getenv("PRICE_TIMEOUT", "10")),
+    max_connections=int(os.getenv("PRICE_MAX_CONNECTIONS", "10")),
+    max_concurrency=int(os.getenv("PRICE_MAX_CONCURRENCY", "4")),
+)
+
+reddit_fetcher = RedditFetcher(
+    client_id=os.getenv("CLIENT_ID"),
+    client_secret=os.getenv("CLIENT_SECRET"),
+    user_agent=os.getenv("USER_AGENT"),
+    max_workers=int(os.getenv("REDDIT_FETCH_WORKERS", "1")),
+    max_queue=int(os.getenv("REDDIT_FETCH_QUEUE", "4")),
+    incremental=os.getenv("REDDIT_INCREMENTAL", "1") == "1",
+    full_refresh_interval=float(os.getenv("REDDIT_FULL_REFRESH_INTERVAL", "3600")),
+)
+
+post_store = PostStore(os.getenv("POST_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "posts.sqlite3")))
+
+price_store = PriceStore(os.getenv("PRICE_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "prices")))
+
+sentiment_cache = SentimentCache(
+    os.getenv("SENTIMENT_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sentiment.sqlite3")),
+    max_entries=int(os.getenv("SENTIMENT_CACHE_SIZE", "100000")),
+)
+# Free text sent to /sentiment gets its own small in-memory cache, so it can neither
+# evict post scores nor cost a SQLite write per request.
+text_sentiment_cache = SentimentCache(max_entries=int(os.getenv("TEXT_SENTIMENT_CACHE_SIZE", "1024")))
+
+daily_index = DailyAggregateIndex()
+
+configure_parallel_sentiment(
+    workers=int(os.getenv("SENTIMENT_WORKERS", "1")),
+    chunk_size=int(os.getenv("SENTIMENT_CHUNK_SIZE", "500")),
+)
+
+def seed_reddit_fetcher():
+    reddit_fetcher.seed(post_store.latest(REDDIT_FETCH_LIMIT), post_store.newest_created_utc())
+
+def seed_daily_index():
+    if len(daily_index):
+        # Already seeded while loading the model (see reference_windows).
+        return
+    update_daily_index(daily_index, post_store.read_range(), sentiment_cache=sentiment_cache)
+
+def store_posts(posts):
+    post_store.upsert(posts)
+    update_daily_index(daily_index, posts, sentiment_cache=sentiment_cache)
+
+def warm_up():
+    model, scaler = get_model_and_scaler()
+    if STARTUP_MODE == "lazy":
+        with startup.step("sentiment analyzer"):
+            get_sentiment_analyzer()
+    with startup.step("warm-up inference"):
+        window = pd.DataFrame([scaler.mean_] * TIME_STEPS, columns=PREDICTION_FEATURES)
+        predict_next_day(window, model, scaler, time_steps=TIME_STEPS, features=PREDICTION_FEATURES)
+    with startup.step("warm-up sentiment"):
+        polarity_scores_many(["Bitcoin warm-up"])
+
+@asynccontextmanager
+async def lifespan(app):
+    await run_in_threadpool(warm_up)
+    with startup.step("seed reddit fetcher"):
+        await run_in_threadpool(seed_reddit_fetcher)
+    with startup.step("seed daily index"):
+        await run_in_threadpool(seed_daily_index)
+    await run_in_threadpool(export_cache.prune)
+    startup.mark_ready()
+    if RESULT_REFRESH_INTERVAL > 0:
+        prediction_scheduler.start()
+    yield
+    await prediction_scheduler.stop()
+    reddit_fetcher.shutdown()
+    if inference_batcher is not None:
+        inference_batcher.shutdown()
+    shutdown_sentiment_pool()
+    await price_client.aclose()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.exception_handler(FetchQueueFull)
+async def fetch_queue_full_handler(request, exc):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
 
 prototype_directory = os.path.abspath('../prototype_data')
 
@@ -30,123 +144,282 @@ sys.path.append(prototype_directory)
 
 model_path = os.path.join(prototype_directory, 'btc_gru_model.h5')
 scaler_path = os.path.join(prototype_directory, 'feature_scaler.pkl')
+scaler_json_path = os.path.join(prototype_directory, 'feature_scaler.json')
+
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "keras")
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "float32")
+MODEL_PRECISION_MAX_ERROR = float(os.getenv("MODEL_PRECISION_MAX_ERROR", "0.01"))
+# Days of features per model input window; must match the time dimension the model was trained on
+TIME_STEPS = int(os.getenv("TIME_STEPS", "2"))
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "256"))
+INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "32"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "2"))
+
+def reference_windows(scaler):
+    """Scaled feature windows from the stored history, for checking reduced-precision inference."""
+    if len(daily_index) == 0:
+        seed_daily_index()
+    history = build_feature_history(daily_index, price_store)
+    if len(history) < TIME_STEPS:
+        return None
+    return sliding_windows(scaler.transform(history[PREDICTION_FEATURES]), TIME_STEPS)
+
+def load_prediction_model(path, backend, scaler=None):
+    if backend == "numpy":
+        # Without enough history load_guarded_model falls back to synthetic reference windows.
+        reference = reference_windows(scaler) if MODEL_PRECISION != "float32" and scaler is not None else None
+        model, report = load_guarded_model(
+            path,
+            precision=MODEL_PRECISION,
+            max_error=MODEL_PRECISION_MAX_ERROR,
+            reference_inputs=reference,
+            reference_name="feature history",
+        )
+        model_time_steps = model.input_shape[0] if model.input_shape else None
+        info = dict(report, backend=backend)
+    elif backend == "keras":
+        if MODEL_PRECISION != "float32":
+            print(f"Warning: MODEL_PRECISION={MODEL_PRECISION} needs MODEL_BACKEND=numpy; using float32.")
+        from tensorflow.keras.models import load_model
+        model = load_model(path)
+        model_time_steps = model.input_shape[1]
+        info = {"backend": backend, "requested_precision": MODEL_PRECISION, "active_precision": "float32"}
+    else:
+        raise ValueError(f"Unknown MODEL_BACKEND: {backend} (expected 'keras' or 'numpy')")
+    if model_time_steps is not None and model_time_steps != TIME_STEPS:
+        raise ValueError(f"TIME_STEPS={TIME_STEPS} does not match the model's input window of {model_time_steps} steps.")
+    return model, dict(info, time_steps=TIME_STEPS)
+
+PREDICTION_FEATURES = ['Range', 'total_score', 'total_comments', 'average_upvote_ratio',
+                       'total_posts', 'percentage_negative',
+                       'percentage_neutral', 'percentage_positive']
+
+# The version covers the model and scaler files and how the model is evaluated.
+prediction_cache = PredictionCache(
+    f"{file_version(model_path, scaler_json_path if os.path.exists(scaler_json_path) else scaler_path)}:{MODEL_BACKEND}:{MODEL_PRECISION}",
+    max_entries=PREDICTION_CACHE_SIZE,
+)
 
-loaded_model = load_model(model_path)
-loaded_scaler = joblib.load(scaler_path)
+loaded_model = None
+loaded_scaler = None
+model_info = None
+inference_batcher = None
+_model_lock = threading.Lock()
+
+def get_model_and_scaler():
+    global loaded_model, loaded_scaler, model_info, inference_batcher
+    if loaded_model is None:
+        with _model_lock:
+            if loaded_model is None:
+                with startup.step("load scaler"):
+                    scaler = load_scaler(scaler_json_path, scaler_path)
+                with startup.step(f"load model ({MODEL_BACKEND} backend)"):
+                    model, info = load_prediction_model(model_path, MODEL_BACKEND, scaler)
+                if INFERENCE_MAX_BATCH > 1:
+                    inference_batcher = InferenceBatcher(model, INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT_MS / 1000)
+                    model = inference_batcher
+                loaded_scaler, model_info, loaded_model = scaler, info, model
+    return loaded_model, loaded_scaler
+
+if STARTUP_MODE == "eager":
+    get_model_and_scaler()
+    with startup.step("sentiment analyzer"):
+        get_sentiment_analyzer()
+elif STARTUP_MODE != "lazy":
+    raise ValueError(f"Unknown STARTUP_MODE: {STARTUP_MODE} (expected 'eager' or 'lazy')")
 
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), "exports")
 os.makedirs(EXPORT_DIR, exist_ok=True)
+# Rendered downloads are cached under EXPORT_DIR and pruned by age and total size at
+# startup, after every render and after every snapshot refresh.
+EXPORT_RETENTION_SECONDS = float(os.getenv("EXPORT_RETENTION_SECONDS", "3600"))
+EXPORT_MAX_BYTES = int(os.getenv("EXPORT_MAX_BYTES", str(100 * 1024 * 1024)))
+
+export_cache = ExportCache(EXPORT_DIR, max_age=EXPORT_RETENTION_SECONDS, max_bytes=EXPORT_MAX_BYTES)
+
+REDDIT_FETCH_LIMIT = int(os.getenv("REDDIT_FETCH_LIMIT", "985"))
+SNAPSHOT_TTL = float(os.getenv("SNAPSHOT_TTL", "300"))
+SNAPSHOT_STALE_TTL = float(os.getenv("SNAPSHOT_STALE_TTL", "600"))
+RESULT_REFRESH_INTERVAL = float(os.getenv("RESULT_REFRESH_INTERVAL", "300"))
+PRICE_WINDOW_DAYS = max(30, TIME_STEPS + 1)
+SENTIMENT_BATCH_MAX = int(os.getenv("SENTIMENT_BATCH_MAX", "10000"))
+SENTIMENT_BATCH_CHUNK = int(os.getenv("SENTIMENT_BATCH_CHUNK", "256"))
+
+async def load_snapshot():
+    reddit_data = await fetch_reddit_posts(REDDIT_FETCH_LIMIT)
+    await run_in_threadpool(store_posts, reddit_data)
+    bitcoin_data = await fetch_bitcoin_price()
+    return Snapshot(reddit_data, bitcoin_data)
+
+snapshot_cache = SnapshotCache(load_snapshot, ttl=SNAPSHOT_TTL, stale_ttl=SNAPSHOT_STALE_TTL)
+
+def compute_prediction(daily_index, price_store):
+    new_market_data = preprocess_reddit_data(daily_index, price_store, sentiment_cache=sentiment_cache, time_steps=TIME_STEPS)
+    if new_market_data is None:
+        raise ValueError("Data preprocessing failed, likely due to insufficient unique dates in Reddit data.")
+    model, scaler = get_model_and_scaler()
+    prediction, confidence = predict_next_day(
+        new_market_data,
+        model,
+        scaler,
+        time_steps=TIME_STEPS,
+        features=PREDICTION_FEATURES,
+        cache=prediction_cache
+    )
+    return {
+        "direction": prediction,
+        "confident": round(confidence * 100, 2),
+    }
+
+async def compute_snapshot_prediction(snapshot):
+    return await run_in_threadpool(compute_prediction, daily_index, price_store)
+
+prediction_scheduler = PredictionScheduler(snapshot_cache.get, compute_snapshot_prediction, interval=RESULT_REFRESH_INTERVAL)
+snapshot_cache.subscribe(prediction_scheduler.trigger)
+def prune_exports():
+    try:
+        export_cache.prune()
+    except Exception as e:
+        print(f"Warning: pruning exports failed: {e}")
+
+def prune_exports_in_background(*args):
+    # Snapshot listeners run on the event loop; scanning and deleting files must not block it.
+    asyncio.get_running_loop().run_in_executor(None, prune_exports)
+
+snapshot_cache.subscribe(prune_exports_in_background)
+
+def snapshot_headers(snapshot):
+    # Shared caches may keep a snapshot response as long as the server itself keeps the
+    # snapshot fresh, and serve it stale for as long as the server would.
+    return cache_headers(
+        snapshot.version,
+        last_modified=snapshot.fetched_at,
+        max_age=snapshot_cache.freshness(),
+        stale_while_revalidate=SNAPSHOT_STALE_TTL,
+    )
 
 @app.get("/result")
-async def get_predict_result():
+async def get_predict_result(request: Request):
     try:
-        reddit_data = await get_reddit_post(limit=985)
-        bitcoin_data = await get_bitcoin_price()
-        new_market_data = preprocess_reddit_data(reddit_data, bitcoin_data)
-        if new_market_data is None:
-            raise HTTPException(status_code=400, detail="Data preprocessing failed, likely due to insufficient unique dates in Reddit data.")
-        prediction, confidence = predict_next_day(
-            new_market_data,
-            loaded_model,
-            loaded_scaler,
-            time_steps=2,
-            features=['Range', 'total_score', 'total_comments', 'average_upvote_ratio',
-                        'total_posts', 'percentage_negative',
-                        'percentage_neutral', 'percentage_positive']
+        result = await prediction_scheduler.get()
+        headers = cache_headers(
+            f"{prediction_scheduler.version}-{prediction_cache.version}",
+            last_modified=datetime.datetime.fromisoformat(result["snapshot_time"]),
+            max_age=min(prediction_scheduler.freshness(), snapshot_cache.freshness()),
         )
-        return {
-            "direction": prediction,
-            "confident": round(confidence * 100, 2),
-        }
+        return not_modified(request, headers) or JSONResponse(jsonable_encoder(result), headers=headers)
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=f"Prediction process error: {ve}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
 
+def run_backtest(start_date, end_date, details):
+    history = build_feature_history(daily_index, price_store)
+    if start_date is not None:
+        history = history[history['Date'] >= start_date]
+    if end_date is not None:
+        history = history[history['Date'] <= end_date]
+    model, scaler = get_model_and_scaler()
+    summary, windows = backtest(history, model, scaler, time_steps=TIME_STEPS, features=PREDICTION_FEATURES)
+    if details:
+        summary["results"] = windows.to_dict(orient='records')
+    return summary
+
+@app.get("/backtest")
+async def get_backtest(
+    start_date: Optional[datetime.date] = Query(None, description="First date of history to use"),
+    end_date: Optional[datetime.date] = Query(None, description="Last date of history to use"),
+    details: bool = Query(False, description="Include every scored window"),
+):
+    try:
+        return await run_in_threadpool(run_backtest, start_date, end_date, details)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=f"Backtest error: {ve}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
+
+EXPORT_FORMAT_QUERY = Query("csv", description="Export format: csv, parquet or arrow")
+
+async def cached_export(request, snapshot, kind, file_format, basename, build, **params):
+    """Serves an export rendered from `snapshot`, rendering it only if the export cache has no copy."""
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    key = ExportCache.make_key(snapshot.version, kind, format=file_format, **params)
+    entry = await run_in_threadpool(export_cache.get, key, file_format)
+    if entry is None:
+        entry = await run_in_threadpool(lambda: export_cache.put(key, build(), file_format))
+    path, etag = entry
+    headers = {"ETag": f'"{etag}"'}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        export_cache.release(path)
+        return Response(status_code=304, headers=headers)
+    extension, media_type = EXPORT_FORMATS[file_format]
+    # The file stays protected from pruning until it has been sent.
+    return FileResponse(
+        path, media_type=media_type, filename=basename + extension, headers=headers,
+        background=BackgroundTask(export_cache.release, path),
+    )
+
 @app.get("/download-preprocess-data")
-async def download_preprocessed_data_endpoint():
-    output_filepath = None
+async def download_preprocessed_data_endpoint(request: Request, format: str = EXPORT_FORMAT_QUERY):
     try:
-        reddit_data = await get_reddit_post(limit=985)
-        bitcoin_data = await get_bitcoin_price()
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv", dir=EXPORT_DIR, mode='w') as temp_file:
-            output_filepath = temp_file.name
-        export_preprocessed_data(reddit_data, bitcoin_data, output_filepath)
-        if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
-             if output_filepath and os.path.exists(output_filepath):
-                 os.remove(output_filepath)
-             raise HTTPException(status_code=500, detail="Failed to generate preprocessed data file (possibly due to insufficient source data).")
-        return FileResponse(
-            path=output_filepath,
-            filename=f"preprocessed_bitcoin_sentiment_{datetime.date.today()}.csv",
-            media_type='text/csv',
+        snapshot = await snapshot_cache.get()
+        return await cached_export(
+            request, snapshot, "preprocessed", format, f"preprocessed_bitcoin_sentiment_{datetime.date.today()}",
+            # The same inputs compute_prediction uses, so the export holds the features /result scored.
+            lambda: preprocess_reddit_data(daily_index, price_store, sentiment_cache=sentiment_cache, time_steps=TIME_STEPS),
+            time_steps=TIME_STEPS,
         )
     except ValueError as ve:
-        if output_filepath and os.path.exists(output_filepath): os.remove(output_filepath)
         raise HTTPException(status_code=400, detail=f"Data preprocessing/export error: {ve}")
     except Exception as e:
-        if output_filepath and os.path.exists(output_filepath): os.remove(output_filepath)
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
 
 @app.get("/download-reddit-data")
-async def download_reddit_data_endpoint():
+async def download_reddit_data_endpoint(request: Request, format: str = EXPORT_FORMAT_QUERY):
     try:
-        reddit_data_list = await get_reddit_post(limit=985) 
-        if not reddit_data_list:
+        snapshot = await snapshot_cache.get()
+        if not snapshot.reddit:
              raise HTTPException(status_code=404, detail="No Reddit posts found.")
-        reddit_df = pd.DataFrame(reddit_data_list)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv", dir=EXPORT_DIR, mode='w', encoding='utf-8') as temp_file:
-            output_filepath = temp_file.name
-            reddit_df.to_csv(output_filepath, index=False, encoding='utf-8')
-        if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
-             if os.path.exists(output_filepath): os.remove(output_filepath)
-             raise HTTPException(status_code=500, detail="Failed to generate raw Reddit data file.")
-        return FileResponse(
-            path=output_filepath,
-            filename=f"raw_reddit_posts_{datetime.date.today()}.csv",
-            media_type='text/csv',
+        return await cached_export(
+            request, snapshot, "reddit", format, f"raw_reddit_posts_{datetime.date.today()}",
+            lambda: pd.DataFrame(snapshot.reddit),
         )
+    except HTTPException:
+        raise
     except ValueError as ve:
-        if 'output_filepath' in locals() and os.path.exists(output_filepath): os.remove(output_filepath)
         raise HTTPException(status_code=400, detail=f"Data processing error: {ve}")
     except Exception as e:
-        if 'output_filepath' in locals() and os.path.exists(output_filepath): os.remove(output_filepath)
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
 
 @app.get("/download-bitcoin-price")
-async def download_bitcoin_price_endpoint():
+async def download_bitcoin_price_endpoint(request: Request, format: str = EXPORT_FORMAT_QUERY):
     try:
-        bitcoin_data_list = await get_bitcoin_price()
-        if not bitcoin_data_list:
+        snapshot = await snapshot_cache.get()
+        if not snapshot.bitcoin:
             raise HTTPException(status_code=404, detail="No Bitcoin price data found.")
-        bitcoin_df = pd.DataFrame(bitcoin_data_list)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv", dir=EXPORT_DIR, mode='w', encoding='utf-8') as temp_file:
-            output_filepath = temp_file.name
-            bitcoin_df.to_csv(output_filepath, index=False, encoding='utf-8')
-        if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
-             if os.path.exists(output_filepath):
-                 os.remove(output_filepath)
-             raise HTTPException(status_code=500, detail="Failed to generate Bitcoin price data file.")
-        return FileResponse(
-            path=output_filepath,
-            filename=f"bitcoin_price_last_30_days_{datetime.date.today()}.csv",
-            media_type='text/csv',
+        return await cached_export(
+            request, snapshot, "bitcoin", format, f"bitcoin_price_last_30_days_{datetime.date.today()}",
+            lambda: pd.DataFrame(snapshot.bitcoin),
         )
     except HTTPException as he:
         raise he
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=f"Data processing error: {ve}")
     except Exception as e:
-        if 'output_filepath' in locals() and os.path.exists(output_filepath):
-             os.remove(output_filepath)
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {e}")
 
 @app.get("/aggregated-reddit-data")
-async def get_aggregated_reddit_data():
+async def get_aggregated_reddit_data(request: Request):
     try:
-        reddit_data = await get_reddit_post(limit=985)
-        result_data, _ = preprocess_reddit_only(reddit_data, 10)
+        headers = snapshot_headers(await snapshot_cache.get())
+        response = not_modified(request, headers)
+        if response is not None:
+            return response
+        result_data, _ = preprocess_reddit_only(daily_index, 10)
 
         if isinstance(result_data, pd.DataFrame):
-            return result_data.to_dict(orient='records')
+            return await run_in_threadpool(negotiated_response, request, result_data, headers)
         else:
             return []
 
@@ -156,66 +429,98 @@ async def get_aggregated_reddit_data():
         raise HTTPException(status_code=500, detail=f"An internal server error occurred processing aggregated data: {e}")
 
 @app.get("/bitcoin")
-async def get_bitcoin_price():
-    coin_id = "bitcoin"
-    vs_currency = "usd"
-    days = "30"
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart?vs_currency={vs_currency}&days={days}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        prices = data["prices"]
-        csv_data = []
-        for timestamp, price in prices:
-            date = datetime.datetime.fromtimestamp(timestamp / 1000, tz=datetime.timezone.utc)
-            formatted_date = date.strftime("%Y-%m-%d %H:%M")
-            csv_data.append({"date": formatted_date, "price": price})
-    return csv_data
+async def get_bitcoin_price(request: Request):
+    snapshot = await snapshot_cache.get()
+    headers = snapshot_headers(snapshot)
+    return not_modified(request, headers) or await run_in_threadpool(negotiated_response, request, snapshot.bitcoin, headers)
+
+async def fetch_bitcoin_price():
+    now = time.time()
+    window_start = now - PRICE_WINDOW_DAYS * 24 * 60 * 60
+    last_timestamp = price_store.last_timestamp()
+    if last_timestamp is None or last_timestamp / 1000 < window_start:
+        prices = await price_client.market_chart(coin_id="bitcoin", vs_currency="usd", days=PRICE_WINDOW_DAYS)
+    else:
+        prices = await price_client.market_chart_range(last_timestamp / 1000, now, coin_id="bitcoin", vs_currency="usd")
+    await run_in_threadpool(price_store.append, prices)
+    return await run_in_threadpool(price_store.to_records, int(window_start * 1000))
 
 @app.get("/reddit")
-async def get_reddit_post(limit: int = Query(985, description="Maximum number of posts to retrieve")):
-    CLIENT_ID = os.getenv("CLIENT_ID")
-    CLIENT_SECRET = os.getenv("CLIENT_SECRET")
-    USER_AGENT = os.getenv("USER_AGENT")
-    reddit = praw.Reddit(
-        client_id=CLIENT_ID,
-        client_secret=CLIENT_SECRET,
-        user_agent=USER_AGENT
-    )
-    subreddit_name = "bitcoin"
-    num_posts = limit
-    data = []
-    count = 0
-    subreddit = reddit.subreddit(subreddit_name)
-    for submission in subreddit.new(limit=None):
-        if count >= num_posts:
-            break
-        data.append({
-            "id": submission.id,
-            "time": datetime.datetime.fromtimestamp(submission.created_utc, tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
-            "url": submission.url,
-            "title": submission.title,
-            "upvote": submission.score,
-            "num_comments": submission.num_comments,
-            "text": submission.selftext,
-            "upvote_ratio": submission.upvote_ratio if hasattr(submission, 'upvote_ratio') else None,
-        })
-        count += 1
-    return data
+async def get_reddit_post(request: Request, limit: int = Query(985, description="Maximum number of posts to retrieve")):
+    if limit > REDDIT_FETCH_LIMIT:
+        # Fetched live rather than from the snapshot, so there is no version to validate against.
+        posts = await fetch_reddit_posts(limit)
+        headers = {"Cache-Control": "no-cache"}
+    else:
+        snapshot = await snapshot_cache.get()
+        headers = snapshot_headers(snapshot)
+        response = not_modified(request, headers)
+        if response is not None:
+            return response
+        posts = snapshot.reddit[:limit]
+    return await run_in_threadpool(negotiated_response, request, posts, headers)
+
+async def fetch_reddit_posts(limit):
+    return await reddit_fetcher.fetch(limit)
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        "snapshot_cache": snapshot_cache.stats,
+        "reddit_fetcher": reddit_fetcher.metrics(),
+        "prediction_scheduler": prediction_scheduler.status(),
+        "sentiment_cache": dict(sentiment_cache.stats, size=len(sentiment_cache)),
+        "text_sentiment_cache": dict(text_sentiment_cache.stats, size=len(text_sentiment_cache)),
+        "startup": startup.as_dict(),
+        "model": model_info,
+        "prediction_cache": prediction_cache.metrics(),
+        "export_cache": export_cache.metrics(),
+        "inference_batcher": inference_batcher.metrics() if inference_batcher is not None else None,
+        "daily_index": {"posts": len(daily_index), "days": len(daily_index.dates())},
+    }
 
 @app.get("/sentiment")
 async def get_sentiment(text: str = Query(..., description="The input text to analyze")):
-    sid = SentimentIntensityAnalyzer()
-    scores = sid.polarity_scores(text)
-    compound_score = scores['compound']
-    result = ""
-    if compound_score > 0.05:
-        result = 'positive'
-    elif compound_score < -0.05:
-        result = 'negative'
-    else:
-        result = 'neutral'
+    scores = (await run_in_threadpool(polarity_scores_many, [text], cache=text_sentiment_cache))[0]
+    result = sentiment_label(scores['compound'])
     return {"result": result, "score": scores}
 
+class SentimentBatchRequest(BaseModel):
+    texts: Optional[List[str]] = None
+    ids: Optional[List[str]] = None
+
+@app.post("/sentiment/batch")
+async def get_sentiment_batch(request: SentimentBatchRequest):
+    if (request.texts is None) == (request.ids is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of 'texts' or 'ids'.")
+    items = request.texts if request.texts is not None else request.ids
+    if len(items) > SENTIMENT_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {SENTIMENT_BATCH_MAX} items can be scored per request.")
+
+    not_found = []
+    if request.ids is not None:
+        posts = await run_in_threadpool(post_store.get_many, request.ids)
+        not_found = [post_id for post_id in request.ids if post_id not in posts]
+        ids = [post_id for post_id in request.ids if post_id in posts]
+        texts = [f"{posts[post_id]['title'] or ''} {posts[post_id]['text'] or ''}" for post_id in ids]
+    else:
+        ids = None
+        texts = request.texts
+
+    results = []
+    for start in range(0, len(texts), SENTIMENT_BATCH_CHUNK):
+        chunk = texts[start:start + SENTIMENT_BATCH_CHUNK]
+        chunk_ids = ids[start:start + SENTIMENT_BATCH_CHUNK] if ids is not None else None
+        cache = sentiment_cache if chunk_ids is not None else text_sentiment_cache
+        results.extend(await run_in_threadpool(score_sentiments, chunk, ids=chunk_ids, cache=cache))
+
+    response = []
+    for i, (label, compound) in enumerate(results):
+        item = {"result": label, "compound": compound}
+        if ids is not None:
+            item["id"] = ids[i]
+        response.append(item)
+    return {"results": response, "not_found": not_found}
+
 if __name__ == "__main__":
     uvicorn.run("very_fast:app", host="127.0.0.1", port=6969, reload=True)
\ No newline at end of file
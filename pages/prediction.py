@@ -55,6 +55,10 @@ if 'preprocess_data_content' not in st.session_state:
     st.session_state.preprocess_data_content = None
 if 'preprocess_data_filename' not in st.session_state:
     st.session_state.preprocess_data_filename = None
+# Last downloaded export and its ETag; kept across "Refresh Data" so an unchanged
+# export is revalidated with If-None-Match instead of downloaded again.
+if 'preprocess_data_cache' not in st.session_state:
+    st.session_state.preprocess_data_cache = None
 if 'price_data_content' not in st.session_state:
     st.session_state.price_data_content = None
 if 'price_data_filename' not in st.session_state:
@@ -162,8 +166,14 @@ with dashboard_container:
         if st.button("Prepare Preprocessed Sentiment Data (CSV)"):
             try:
                 with st.spinner("Fetching preprocessed data..."):
-                    download_response = requests.get(f"{BASE_URL}/download-preprocess-data")
-                    if download_response.status_code == 200:
+                    cached = st.session_state.preprocess_data_cache
+                    headers = {'If-None-Match': cached['etag']} if cached else {}
+                    download_response = requests.get(f"{BASE_URL}/download-preprocess-data", headers=headers)
+                    if download_response.status_code == 304 and cached:
+                        st.session_state.preprocess_data_content = cached['content']
+                        st.session_state.preprocess_data_filename = cached['filename']
+                        st.success("Preprocessed data is unchanged and ready for download below.")
+                    elif download_response.status_code == 200:
                         content_disposition = download_response.headers.get('content-disposition')
                         filename = f"preprocessed_bitcoin_sentiment_{datetime.now().strftime('%Y%m%d')}.csv"
                         if content_disposition:
@@ -173,6 +183,10 @@ with dashboard_container:
                         
                         st.session_state.preprocess_data_content = download_response.content
                         st.session_state.preprocess_data_filename = filename
+                        etag = download_response.headers.get('etag')
+                        st.session_state.preprocess_data_cache = (
+                            {'etag': etag, 'content': download_response.content, 'filename': filename} if etag else None
+                        )
                         st.success("Preprocessed data is ready for download below.")
                     else:
                         st.session_state.preprocess_data_content = None
@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+
+class AffineScaler:
+    """
+    Standardizes features as (x - mean) / scale, the transform of a fitted StandardScaler.
+
+    The parameters come from a small JSON file, so applying the scaler needs neither
+    scikit-learn nor joblib. transform() accepts a DataFrame (columns are picked by
+    name) or an array whose last axis holds the features, so whole batches of windows
+    of shape (windows, time_steps, features) are scaled in one vectorized operation.
+
+    Args:
+        mean (list): Per-feature mean.
+        scale (list): Per-feature standard deviation.
+        feature_names (list, optional): Feature names, in order.
+    """
+
+    def __init__(self, mean, scale, feature_names=None):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object) if feature_names is not None else None
+
+    def transform(self, X):
+        if hasattr(X, 'columns'):
+            if self.feature_names_in_ is not None:
+                X = X[list(self.feature_names_in_)]
+            X = X.to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        if X.shape[-1] != len(self.mean_):
+            raise ValueError(f"Expected {len(self.mean_)} features, got {X.shape[-1]}.")
+        return (X - self.mean_) / self.scale_
+
+    @classmethod
+    def from_sklearn(cls, scaler):
+        """Builds an AffineScaler from a fitted sklearn StandardScaler."""
+        n_features = scaler.n_features_in_
+        mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros(n_features)
+        scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones(n_features)
+        names = getattr(scaler, 'feature_names_in_', None)
+        return cls(mean, scale, list(names) if names is not None else None)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            params = json.load(f)
+        return cls(params['mean'], params['scale'], params.get('feature_names'))
+
+    def save(self, path):
+        params = {
+            'feature_names': list(self.feature_names_in_) if self.feature_names_in_ is not None else None,
+            'mean': self.mean_.tolist(),
+            'scale': self.scale_.tolist(),
+        }
+        with open(path, 'w') as f:
+            json.dump(params, f, indent=2)
+            f.write('\n')
+
+
+def load_scaler(json_path, pickle_path=None):
+    """
+    Loads the feature scaler from its JSON parameters, falling back to the pickled sklearn object.
+
+    Args:
+        json_path (str): Path of the JSON file written by AffineScaler.save.
+        pickle_path (str, optional): Path of the joblib-pickled StandardScaler.
+
+    Returns:
+        AffineScaler or sklearn StandardScaler
+    """
+    if os.path.exists(json_path):
+        return AffineScaler.load(json_path)
+    if pickle_path is None:
+        raise FileNotFoundError(json_path)
+    print(f"Warning: {json_path} not found; loading the pickled scaler (imports scikit-learn).")
+    import joblib
+    return joblib.load(pickle_path)
+
+
+def export_scaler_json(pickle_path, json_path):
+    """Writes the parameters of a pickled StandardScaler to JSON."""
+    import joblib
+    AffineScaler.from_sklearn(joblib.load(pickle_path)).save(json_path)
+
+
+if __name__ == '__main__':
+    # Usage: python prototype_data/affine_scaler.py [feature_scaler.pkl] [feature_scaler.json]
+    directory = os.path.dirname(os.path.abspath(__file__))
+    pickle_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(directory, 'feature_scaler.pkl')
+    json_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(directory, 'feature_scaler.json')
+    export_scaler_json(pickle_path, json_path)
+    print(f"Scaler parameters exported to {json_path}")
@@ -0,0 +1,143 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from prototype_data.daily_index import DailyAggregateIndex
+from prototype_data.price_store import PriceStore
+
+
+def build_feature_history(reddit_data, bitcoin_data, complete_before=None):
+    """
+    Builds the full daily feature history: Reddit metrics merged with the price Range.
+
+    Days on or after `complete_before` are left out: their posts and prices are still
+    arriving, so their metrics and Range are not final.
+
+    Args:
+        reddit_data (DailyAggregateIndex or pd.DataFrame): Daily Reddit metrics, as kept by the
+            index or returned by preprocess_reddit_only.
+        bitcoin_data (PriceStore or pd.DataFrame): Prices, or daily rows with Date and Range.
+        complete_before (datetime.date, optional): First incomplete day. Defaults to the
+            current UTC date.
+
+    Returns:
+        pd.DataFrame: One row per complete date present in both sources, sorted by Date.
+            Dates missing from either source are absent, so rows need not be consecutive.
+    """
+    if complete_before is None:
+        complete_before = datetime.datetime.now(tz=datetime.timezone.utc).date()
+    reddit_rows = reddit_data.rows() if isinstance(reddit_data, DailyAggregateIndex) else reddit_data
+    price_rows = bitcoin_data.daily_ohlc() if isinstance(bitcoin_data, PriceStore) else bitcoin_data
+    if reddit_rows.empty or price_rows.empty:
+        return reddit_rows.iloc[:0].assign(Range=pd.Series(dtype=np.float64))
+    merged = pd.merge(reddit_rows, price_rows[['Date', 'Range']], on='Date', how='inner')
+    merged = merged[merged['Date'] < complete_before]
+    return merged.sort_values('Date', ignore_index=True)
+
+
+def sliding_windows(values, time_steps):
+    """
+    Returns every window of `time_steps` consecutive rows as a read-only strided view.
+
+    Args:
+        values (np.ndarray): Array of shape (rows, features).
+        time_steps (int): Rows per window.
+
+    Returns:
+        np.ndarray: View of shape (rows - time_steps + 1, time_steps, features) sharing
+            memory with `values`.
+    """
+    if len(values) < time_steps:
+        return np.empty((0, time_steps, values.shape[1]), dtype=values.dtype)
+    return sliding_window_view(values, time_steps, axis=0).transpose(0, 2, 1)
+
+
+def backtest(history, model, scaler, time_steps=2, features=None, target='Range'):
+    """
+    Scores the model on every window of a feature history against what happened next.
+
+    The history is scaled once into a contiguous array, every window is a strided view
+    over it, and all windows go through the model in one batched predict call. The
+    window ending at row i is scored against the sign of `target` at row i + 1, the same
+    next-period direction /result predicts. Works on any row frequency (daily, hourly).
+
+    If the history has a Date column its rows are days, and only windows whose
+    `time_steps + 1` dates (window plus target) are consecutive are scored; windows
+    spanning a missing day are counted in the summary's `skipped_windows`.
+
+    Args:
+        history (pd.DataFrame): Feature rows sorted by time, including `target`.
+        model: Object with a Keras-style predict(x, verbose=0) method.
+        scaler: Fitted scaler with a transform() method.
+        time_steps (int): Rows per window. Defaults to 2.
+        features (list, optional): Feature columns in model order. Defaults to the
+            scaler's feature_names_in_.
+        target (str): Column whose sign is the realized direction. Defaults to 'Range'.
+
+    Returns:
+        tuple: (dict of summary stats, pd.DataFrame with one row per scored window)
+
+    Raises:
+        ValueError: If the history is too short to score a single window, or no window
+            covers consecutive dates.
+    """
+    if features is None:
+        features = list(scaler.feature_names_in_)
+    if len(history) < time_steps + 1:
+        raise ValueError(f"Need at least {time_steps + 1} rows of history to backtest, got {len(history)}.")
+
+    scaled = np.ascontiguousarray(scaler.transform(history[features]), dtype=np.float32)
+    # The last window has no following row to check against.
+    windows = sliding_windows(scaled, time_steps)[:-1]
+    targets = np.arange(time_steps, len(history))
+    skipped = 0
+    if 'Date' in history.columns:
+        consecutive = _consecutive_windows(history['Date'], time_steps)
+        skipped = int(np.count_nonzero(~consecutive))
+        if skipped:
+            windows, targets = windows[consecutive], targets[consecutive]
+        if len(targets) == 0:
+            raise ValueError(f"No {time_steps + 1} consecutive dates in the history to backtest.")
+    probabilities = np.asarray(model.predict(windows, verbose=0), dtype=np.float64).reshape(-1)
+
+    predicted_up = probabilities > 0.5
+    actual_up = history[target].to_numpy()[targets] > 0
+
+    results = pd.DataFrame({
+        'probability': probabilities,
+        'predicted': np.where(predicted_up, 'up', 'down'),
+        'actual': np.where(actual_up, 'up', 'down'),
+    })
+    if 'Date' in history.columns:
+        results.insert(0, 'Date', history['Date'].to_numpy()[targets])
+
+    summary = summarize(predicted_up, actual_up)
+    summary["skipped_windows"] = skipped
+    return summary, results
+
+
+def _consecutive_windows(dates, time_steps):
+    """Flags, per scorable window, whether its rows and target row fall on consecutive days."""
+    days = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]').astype(np.int64)
+    next_day = (np.diff(days) == 1)[:, None]
+    return sliding_windows(next_day, time_steps)[:, :, 0].all(axis=1)
+
+
+def summarize(predicted_up, actual_up):
+    """Computes hit rate and confusion stats from boolean predicted and realized directions."""
+    true_up = int(np.count_nonzero(predicted_up & actual_up))
+    false_up = int(np.count_nonzero(predicted_up & ~actual_up))
+    true_down = int(np.count_nonzero(~predicted_up & ~actual_up))
+    false_down = int(np.count_nonzero(~predicted_up & actual_up))
+    total = len(predicted_up)
+    return {
+        "windows": total,
+        "hit_rate": (true_up + true_down) / total if total else None,
+        "confusion": {"true_up": true_up, "false_up": false_up, "true_down": true_down, "false_down": false_down},
+        "precision_up": true_up / (true_up + false_up) if true_up + false_up else None,
+        "recall_up": true_up / (true_up + false_down) if true_up + false_down else None,
+        "predicted_up_rate": float(np.mean(predicted_up)) if total else None,
+        "actual_up_rate": float(np.mean(actual_up)) if total else None,
+    }
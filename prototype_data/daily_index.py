@@ -0,0 +1,150 @@
+import datetime
+import math
+import threading
+
+import pandas as pd
+
+SENTIMENT_CLASSES = ['negative', 'neutral', 'positive']
+
+
+class DayTotals:
+    """Running sums and counts of one UTC day."""
+    __slots__ = ('score', 'comments', 'ratio_sum', 'ratio_count', 'posts', 'class_counts')
+
+    def __init__(self):
+        self.score = 0
+        self.comments = 0
+        self.ratio_sum = 0.0
+        self.ratio_count = 0
+        self.posts = 0
+        self.class_counts = [0] * len(SENTIMENT_CLASSES)
+
+    def apply(self, contribution, sign):
+        _, score, comments, ratio, code = contribution
+        self.score += sign * score
+        self.comments += sign * comments
+        if ratio is not None:
+            self.ratio_sum += sign * ratio
+            self.ratio_count += sign
+        self.posts += sign
+        self.class_counts[code] += sign
+
+
+class DailyAggregateIndex:
+    """
+    Per-day aggregate of Reddit posts, maintained incrementally as posts arrive.
+
+    Every day keeps running sums of score, comments and upvote ratio plus post and
+    sentiment class counts. The index also remembers each post's last contribution,
+    so adding a post or updating a re-crawled one is O(1): the old contribution is
+    subtracted and the new one added. Reading the metrics of a few days is then a
+    lookup instead of a re-aggregation of raw rows.
+
+    The metrics match preprocess_reddit_only; the average upvote ratio may differ
+    from a fresh aggregation in the last floating-point digits after many updates.
+    """
+
+    def __init__(self):
+        self._days = {}
+        self._posts = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._posts)
+
+    def upsert(self, post, sentiment):
+        """
+        Adds a post, or replaces its previous contribution if it is already indexed.
+
+        Args:
+            post (dict): Post dict in the /reddit endpoint format.
+            sentiment (str): One of SENTIMENT_CLASSES.
+        """
+        contribution = (
+            _post_date(post),
+            post.get('upvote') or 0,
+            post.get('num_comments') or 0,
+            _ratio(post.get('upvote_ratio')),
+            SENTIMENT_CLASSES.index(sentiment),
+        )
+        with self._lock:
+            previous = self._posts.get(post['id'])
+            if previous is not None:
+                self._apply(previous, -1)
+            self._posts[post['id']] = contribution
+            self._apply(contribution, 1)
+
+    def upsert_many(self, posts, sentiments):
+        """Upserts posts with their aligned sentiment labels."""
+        for post, sentiment in zip(posts, sentiments):
+            self.upsert(post, sentiment)
+
+    def remove(self, post_id):
+        """Removes a post's contribution. Unknown IDs are ignored."""
+        with self._lock:
+            previous = self._posts.pop(post_id, None)
+            if previous is not None:
+                self._apply(previous, -1)
+
+    def dates(self):
+        """Returns every indexed date, oldest first."""
+        with self._lock:
+            return sorted(self._days)
+
+    def recent_dates(self, num_dates):
+        """Returns the `num_dates` most recent dates that have posts, newest first."""
+        with self._lock:
+            return sorted(self._days, reverse=True)[:num_dates]
+
+    def rows(self, dates=None):
+        """
+        Returns the aggregated metrics of the given dates, sorted by Date.
+
+        Args:
+            dates (list, optional): datetime.date objects. Defaults to every indexed date.
+
+        Returns:
+            pd.DataFrame: Same columns as preprocess_reddit_only's aggregated data.
+        """
+        with self._lock:
+            if dates is None:
+                dates = self._days.keys()
+            records = []
+            for date in sorted(d for d in dates if d in self._days):
+                totals = self._days[date]
+                record = {
+                    'Date': date,
+                    'total_score': totals.score,
+                    'total_comments': totals.comments,
+                    'average_upvote_ratio': totals.ratio_sum / totals.ratio_count if totals.ratio_count else math.nan,
+                    'total_posts': totals.posts,
+                }
+                for label, count in zip(SENTIMENT_CLASSES, totals.class_counts):
+                    record[f'percentage_{label}'] = count / totals.posts * 100
+                records.append(record)
+        return pd.DataFrame(records, columns=[
+            'Date', 'total_score', 'total_comments', 'average_upvote_ratio', 'total_posts',
+            'percentage_negative', 'percentage_neutral', 'percentage_positive'
+        ])
+
+    def _apply(self, contribution, sign):
+        date = contribution[0]
+        totals = self._days.get(date)
+        if totals is None:
+            totals = self._days[date] = DayTotals()
+        totals.apply(contribution, sign)
+        if totals.posts == 0:
+            del self._days[date]
+
+
+def _post_date(post):
+    created_utc = post.get('created_utc')
+    if created_utc is not None:
+        return datetime.datetime.fromtimestamp(created_utc, tz=datetime.timezone.utc).date()
+    return datetime.date.fromisoformat(post['time'][:10])
+
+
+def _ratio(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
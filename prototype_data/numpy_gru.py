@@ -0,0 +1,260 @@
+import json
+
+import h5py
+import numpy as np
+
+ACTIVATIONS = {
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0),
+    'linear': lambda x: x,
+}
+
+PRECISIONS = ('float32', 'float16', 'int8')
+
+
+class NumpyGRUModel:
+    """
+    NumPy inference engine for the Keras GRU classifier saved in btc_gru_model.h5.
+
+    The layer configuration and weights are read once from the HDF5 file with h5py,
+    and predict() evaluates the forward pass with plain NumPy, so serving a
+    prediction needs neither TensorFlow nor Keras. Supported layers are the ones the
+    model uses: InputLayer, GRU (reset_after=True, return_sequences=False),
+    BatchNormalization, Dropout (a no-op at inference) and Dense.
+
+    Reduced precisions shrink the weight matrices: "float16" stores and evaluates
+    everything in half precision, "int8" stores the kernels as int8 with one float32
+    scale per output column and evaluates in float32. Use load_guarded_model to
+    check a reduced precision against float32 before serving it.
+
+    Args:
+        path (str): Path of the Keras .h5 model file.
+        precision (str): One of PRECISIONS.
+
+    Raises:
+        ValueError: If the file contains a layer or option this engine does not implement.
+    """
+
+    def __init__(self, path, precision='float32'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision} (expected one of {', '.join(PRECISIONS)})")
+        self.path = path
+        self.precision = precision
+        self.dtype = np.dtype(np.float16 if precision == 'float16' else np.float32)
+        self.layers = []
+        self.input_shape = None
+        with h5py.File(path, 'r') as f:
+            config = json.loads(_as_str(f.attrs['model_config']))
+            weights = f['model_weights']
+            for layer in config['config']['layers']:
+                kind, layer_config = layer['class_name'], layer['config']
+                if kind == 'InputLayer':
+                    shape = layer_config.get('batch_shape') or layer_config.get('batch_input_shape')
+                    self.input_shape = tuple(shape[1:]) if shape else None
+                if kind in ('InputLayer', 'Dropout'):
+                    continue
+                params = _layer_weights(weights, layer_config['name'])
+                self.layers.append(self._build_layer(kind, layer_config, params))
+
+    def _build_layer(self, kind, config, params):
+        cast = lambda name: params[name].astype(self.dtype)
+        matrix = lambda name: self._pack(params[name])
+        if kind == 'GRU':
+            if not config.get('reset_after', True) or config.get('return_sequences') or config.get('go_backwards'):
+                raise ValueError("Only GRU layers with reset_after=True and return_sequences=False are supported.")
+            layer = {
+                'units': params['recurrent_kernel'].shape[0],
+                'kernel': matrix('kernel'),
+                'recurrent_kernel': matrix('recurrent_kernel'),
+                'activation': _activation(config['activation']),
+                'recurrent_activation': _activation(config['recurrent_activation']),
+            }
+            bias = params.get('bias')
+            if bias is None:
+                bias = np.zeros((2, params['kernel'].shape[1]))
+            layer['input_bias'], layer['recurrent_bias'] = bias.astype(self.dtype)
+            return kind, layer
+        if kind == 'BatchNormalization':
+            std = np.sqrt(params['moving_variance'].astype(np.float64) + config['epsilon'])
+            gamma = params.get('gamma', np.ones_like(std))
+            beta = params.get('beta', np.zeros_like(std))
+            # Fold the normalization into one multiply-add.
+            scale = gamma / std
+            return kind, {
+                'scale': scale.astype(self.dtype),
+                'offset': (beta - params['moving_mean'] * scale).astype(self.dtype),
+            }
+        if kind == 'Dense':
+            return kind, {
+                'kernel': matrix('kernel'),
+                'bias': cast('bias') if 'bias' in params else np.zeros(params['kernel'].shape[1], self.dtype),
+                'activation': _activation(config.get('activation', 'linear')),
+            }
+        raise ValueError(f"Unsupported layer type in {self.path}: {kind}")
+
+    def _pack(self, weights):
+        if self.precision != 'int8':
+            return weights.astype(self.dtype)
+        scale = np.abs(weights).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        return QuantizedMatrix(np.round(weights / scale).astype(np.int8), scale.astype(np.float32))
+
+    @property
+    def nbytes(self):
+        """Bytes held by the model's weights."""
+        total = 0
+        for _, layer in self.layers:
+            for value in layer.values():
+                if isinstance(value, (np.ndarray, QuantizedMatrix)):
+                    total += value.nbytes
+        return total
+
+    def predict(self, x, verbose=0):
+        """
+        Runs the forward pass, mirroring keras.Model.predict.
+
+        Args:
+            x (np.ndarray): Input of shape (batch, time_steps, features).
+            verbose: Ignored; accepted for compatibility with Keras.
+
+        Returns:
+            np.ndarray: Model output of shape (batch, units of the last layer).
+        """
+        output = np.asarray(x, dtype=self.dtype)
+        for kind, layer in self.layers:
+            if kind == 'GRU':
+                output = _gru(output, layer)
+            elif kind == 'BatchNormalization':
+                output = output * layer['scale'] + layer['offset']
+            else:
+                output = layer['activation'](_matmul(output, layer['kernel']) + layer['bias'])
+        return output
+
+
+class QuantizedMatrix:
+    """int8 weight matrix with one float32 scale per output column."""
+    __slots__ = ('values', 'scale')
+
+    def __init__(self, values, scale):
+        self.values = values
+        self.scale = scale
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.scale.nbytes
+
+
+def load_guarded_model(path, precision='float32', max_error=0.01, reference_inputs=None, reference_name='provided'):
+    """
+    Loads a NumpyGRUModel at the requested precision if it stays accurate enough.
+
+    The reduced-precision model is evaluated next to the float32 model on reference
+    inputs. It is only activated if no prediction changes direction (probability on
+    the other side of 0.5) and the largest absolute probability error is at most
+    `max_error`; otherwise, or if the error is not finite, the float32 model is returned.
+
+    Args:
+        path (str): Path of the Keras .h5 model file.
+        precision (str): One of PRECISIONS.
+        max_error (float): Largest tolerated absolute difference in probability.
+        reference_inputs (np.ndarray, optional): Scaled feature windows of shape
+            (n, time_steps, features), ideally taken from real feature history. Real
+            scaled features are heavy-tailed, so when none are given the fallback of 512
+            fixed standard-normal windows only approximates the inputs seen in service.
+            Windows containing NaN or infinite values are dropped before comparing.
+        reference_name (str): Label of `reference_inputs` recorded in the report.
+
+    Returns:
+        tuple: (NumpyGRUModel, dict report with requested and active precision,
+               max_abs_error, direction_flips, the reference set used and weight bytes)
+    """
+    reference = NumpyGRUModel(path)
+    report = {
+        "requested_precision": precision,
+        "active_precision": "float32",
+        "max_abs_error": 0.0,
+        "direction_flips": 0,
+        "reference_inputs": None,
+        "reference_windows": 0,
+        "weight_bytes": reference.nbytes,
+    }
+    if precision == 'float32':
+        return reference, report
+
+    candidate = NumpyGRUModel(path, precision=precision)
+    if reference_inputs is not None and len(reference_inputs):
+        # Windows with missing features say nothing about precision; compare on the rest.
+        reference_inputs = np.asarray(reference_inputs, dtype=np.float64)
+        finite = np.isfinite(reference_inputs.reshape(len(reference_inputs), -1)).all(axis=1)
+        report["dropped_reference_windows"] = int(np.count_nonzero(~finite))
+        reference_inputs = reference_inputs[finite]
+    if reference_inputs is None or len(reference_inputs) == 0:
+        reference_inputs = np.random.default_rng(0).standard_normal((512,) + reference.input_shape)
+        reference_name = 'synthetic'
+    report["reference_inputs"] = reference_name
+    report["reference_windows"] = len(reference_inputs)
+    expected = reference.predict(reference_inputs).astype(np.float64)
+    actual = candidate.predict(reference_inputs).astype(np.float64)
+    max_abs_error = float(np.abs(actual - expected).max())
+    report["direction_flips"] = int(np.count_nonzero((actual > 0.5) != (expected > 0.5)))
+
+    if not np.isfinite(max_abs_error):
+        # A NaN error compares false against max_error; fail closed instead. None keeps the report JSON-safe.
+        report["max_abs_error"] = None
+        print(f"Warning: {precision} inference rejected (non-finite error on reference inputs); using float32.")
+        return reference, report
+    report["max_abs_error"] = max_abs_error
+    if report["direction_flips"] or max_abs_error > max_error:
+        print(f"Warning: {precision} inference rejected ({report['direction_flips']} direction flips, "
+              f"max error {max_abs_error:.2e}); using float32.")
+        return reference, report
+    report["active_precision"] = precision
+    report["weight_bytes"] = candidate.nbytes
+    return candidate, report
+
+
+def _matmul(x, weights):
+    if isinstance(weights, QuantizedMatrix):
+        return (x @ weights.values) * weights.scale
+    return x @ weights
+
+
+def _gru(x, layer):
+    units = layer['units']
+    # Input projections of every time step at once; gate order is update, reset, candidate.
+    projected = _matmul(x, layer['kernel']) + layer['input_bias']
+    state = np.zeros((x.shape[0], units), dtype=x.dtype)
+    for step in range(x.shape[1]):
+        inputs = projected[:, step]
+        recurrent = _matmul(state, layer['recurrent_kernel']) + layer['recurrent_bias']
+        update = layer['recurrent_activation'](inputs[:, :units] + recurrent[:, :units])
+        reset = layer['recurrent_activation'](inputs[:, units:2 * units] + recurrent[:, units:2 * units])
+        candidate = layer['activation'](inputs[:, 2 * units:] + reset * recurrent[:, 2 * units:])
+        state = update * state + (1 - update) * candidate
+    return state
+
+
+def _layer_weights(weights, name):
+    params = {}
+    if name not in weights:
+        return params
+
+    def collect(key, item):
+        if isinstance(item, h5py.Dataset):
+            params[key.rsplit('/', 1)[-1].split(':')[0]] = item[()]
+
+    weights[name].visititems(collect)
+    return params
+
+
+def _activation(name):
+    if isinstance(name, dict):
+        name = name.get('config', {}).get('name', name.get('class_name'))
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {name}")
+    return ACTIVATIONS[name]
+
+
+def _as_str(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
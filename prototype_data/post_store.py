@@ -0,0 +1,169 @@
+import datetime
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+POST_COLUMNS = ['id', 'time', 'url', 'title', 'upvote', 'num_comments', 'text', 'upvote_ratio']
+
+
+class PostStore:
+    """
+    On-disk store of raw Reddit posts, partitioned by UTC date.
+
+    Posts live in one SQLite table whose `date` column (the post's UTC date) is the
+    partition key. The (date, created_utc) index lets date-range reads touch only the
+    partitions they need, and `id` is the primary key so re-crawled posts are upserted
+    in place instead of duplicated.
+
+    Args:
+        path (str): Path of the SQLite database file. Parent directories are created.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id TEXT PRIMARY KEY,
+                    created_utc REAL NOT NULL,
+                    date TEXT NOT NULL,
+                    time TEXT,
+                    url TEXT,
+                    title TEXT,
+                    upvote INTEGER,
+                    num_comments INTEGER,
+                    text TEXT,
+                    upvote_ratio REAL,
+                    fetched_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_date_created ON posts(date, created_utc)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_utc)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def upsert(self, posts):
+        """
+        Inserts new posts and updates existing ones, keyed by submission ID.
+
+        Args:
+            posts (list): Post dicts as returned by the /reddit endpoint. A `created_utc`
+                key is used when present, otherwise it is derived from `time`.
+
+        Returns:
+            int: Number of posts written.
+        """
+        fetched_at = time.time()
+        rows = []
+        for post in posts:
+            created_utc = post.get('created_utc')
+            if created_utc is None:
+                created_utc = _parse_time(post['time']).timestamp()
+            date = datetime.datetime.fromtimestamp(created_utc, tz=datetime.timezone.utc).date().isoformat()
+            rows.append((
+                post['id'], created_utc, date, post.get('time'), post.get('url'), post.get('title'),
+                post.get('upvote'), post.get('num_comments'), post.get('text'), post.get('upvote_ratio'),
+                fetched_at,
+            ))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("""
+                INSERT INTO posts (id, created_utc, date, time, url, title, upvote, num_comments, text, upvote_ratio, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    url=excluded.url,
+                    title=excluded.title,
+                    upvote=excluded.upvote,
+                    num_comments=excluded.num_comments,
+                    text=excluded.text,
+                    upvote_ratio=excluded.upvote_ratio,
+                    fetched_at=excluded.fetched_at
+            """, rows)
+        return len(rows)
+
+    def read_range(self, start_date=None, end_date=None):
+        """
+        Reads the posts whose UTC date falls in [start_date, end_date], newest first.
+
+        Args:
+            start_date (datetime.date or str, optional): First date to include. Open-ended if None.
+            end_date (datetime.date or str, optional): Last date to include. Open-ended if None.
+
+        Returns:
+            list: Post dicts in the /reddit endpoint format.
+        """
+        clauses, params = [], []
+        if start_date is not None:
+            clauses.append("date >= ?")
+            params.append(str(start_date))
+        if end_date is not None:
+            clauses.append("date <= ?")
+            params.append(str(end_date))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(POST_COLUMNS)} FROM posts {where} ORDER BY created_utc DESC", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_many(self, ids):
+        """
+        Looks up posts by submission ID.
+
+        Returns:
+            dict: Post dicts keyed by ID. IDs that are not stored are left out.
+        """
+        ids = list(ids)
+        posts = {}
+        with closing(self._connect()) as conn:
+            # Stay well below SQLite's bound-parameter limit.
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT {', '.join(POST_COLUMNS)} FROM posts WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                posts.update((row['id'], dict(row)) for row in rows)
+        return posts
+
+    def recent_dates(self, num_dates):
+        """Returns the `num_dates` most recent UTC dates that have posts, newest first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT DISTINCT date FROM posts ORDER BY date DESC LIMIT ?", (num_dates,)).fetchall()
+        return [datetime.date.fromisoformat(row['date']) for row in rows]
+
+    def read_recent_dates(self, num_dates):
+        """Reads every post from the `num_dates` most recent dates that have posts."""
+        dates = self.recent_dates(num_dates)
+        if not dates:
+            return []
+        return self.read_range(dates[-1], dates[0])
+
+    def latest(self, limit):
+        """Returns the newest `limit` posts, newest first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(POST_COLUMNS)} FROM posts ORDER BY created_utc DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def newest_created_utc(self):
+        """Returns the created_utc of the newest stored post, or None if the store is empty."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT MAX(created_utc) AS newest FROM posts").fetchone()
+        return row['newest']
+
+    def count(self):
+        """Returns the number of stored posts."""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+
+def _parse_time(value):
+    return datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
@@ -1,22 +1,167 @@
 import numpy as np
 import pandas as pd
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from prototype_data.post_store import PostStore
+from prototype_data.price_store import PriceStore
+from prototype_data.daily_index import DailyAggregateIndex, SENTIMENT_CLASSES
+from prototype_data.backtest import sliding_windows
+
+# Built on first use: importing nltk and loading the VADER lexicon is slow.
+sid = None
+_sid_lock = threading.Lock()
+
+sentiment_workers = 1
+sentiment_chunk_size = 500
+_sentiment_pool = None
+_sentiment_pool_lock = threading.Lock()
+_worker_sid = None
+
+def configure_parallel_sentiment(workers=1, chunk_size=500):
+    """
+    Sets the default parallelism of sentiment scoring.
 
-sid = SentimentIntensityAnalyzer()
+    Args:
+        workers (int): Number of worker processes. 1 keeps scoring serial in-process.
+        chunk_size (int): Number of texts sent to a worker at a time. Batches smaller
+            than one chunk are always scored serially.
+    """
+    global sentiment_workers, sentiment_chunk_size
+    if workers != sentiment_workers:
+        shutdown_sentiment_pool()
+    sentiment_workers = max(1, int(workers))
+    sentiment_chunk_size = max(1, int(chunk_size))
+
+def shutdown_sentiment_pool():
+    """Stops the sentiment worker processes, if any were started."""
+    global _sentiment_pool
+    with _sentiment_pool_lock:
+        if _sentiment_pool is not None:
+            _sentiment_pool.shutdown(wait=False, cancel_futures=True)
+            _sentiment_pool = None
+
+def get_sentiment_analyzer():
+    """Returns the shared VADER analyzer, importing nltk and loading the lexicon on first call."""
+    global sid
+    if sid is None:
+        with _sid_lock:
+            if sid is None:
+                from nltk.sentiment.vader import SentimentIntensityAnalyzer
+                sid = SentimentIntensityAnalyzer()
+    return sid
+
+def _init_sentiment_worker():
+    # Each worker loads the VADER lexicon once and keeps it for every chunk it scores.
+    global _worker_sid
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    _worker_sid = SentimentIntensityAnalyzer()
+
+def _score_chunk(texts):
+    return [_worker_sid.polarity_scores(text) for text in texts]
+
+def _get_sentiment_pool(workers):
+    global _sentiment_pool
+    pool = _sentiment_pool
+    if pool is None:
+        with _sentiment_pool_lock:
+            if _sentiment_pool is None:
+                # spawn rather than fork: the API process may already hold TensorFlow threads.
+                _sentiment_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_sentiment_worker,
+                )
+            pool = _sentiment_pool
+    return pool
+
+def _polarity_scores(texts, workers=None, chunk_size=None):
+    workers = sentiment_workers if workers is None else workers
+    chunk_size = sentiment_chunk_size if chunk_size is None else chunk_size
+    if workers <= 1 or len(texts) <= chunk_size:
+        analyzer = get_sentiment_analyzer()
+        return [analyzer.polarity_scores(text) for text in texts]
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    pool = _get_sentiment_pool(workers)
+    return [scores for chunk_scores in pool.map(_score_chunk, chunks) for scores in chunk_scores]
+
+def sentiment_label(compound):
+    """Maps a VADER compound score to 'positive', 'negative' or 'neutral'."""
+    return 'positive' if compound > 0.05 else 'negative' if compound < -0.05 else 'neutral'
 
 def get_sentiment_local(text):
     """Optimized sentiment analysis function"""
-    scores = sid.polarity_scores(text)
-    compound = scores['compound']
-    return 'positive' if compound > 0.05 else 'negative' if compound < -0.05 else 'neutral'
+    scores = get_sentiment_analyzer().polarity_scores(text)
+    return sentiment_label(scores['compound'])
+
+def polarity_scores_many(texts, ids=None, cache=None, workers=None, chunk_size=None):
+    """
+    Computes VADER polarity scores for many texts, reusing cached scores when possible.
+
+    Texts that need scoring are split across a process pool when more than one
+    worker is configured (see configure_parallel_sentiment); results are identical
+    to serial scoring.
+
+    Args:
+        texts (list): Texts to score.
+        ids (list, optional): Post IDs aligned with texts, used in the cache key.
+        cache (SentimentCache, optional): Cache checked before scoring and filled after.
+        workers (int, optional): Overrides the configured number of worker processes.
+        chunk_size (int, optional): Overrides the configured chunk size.
+
+    Returns:
+        list: polarity_scores dicts in input order.
+    """
+    if cache is None:
+        return _polarity_scores(list(texts), workers, chunk_size)
+
+    if ids is None:
+        ids = [None] * len(texts)
+    keys = [cache.make_key(post_id, text) for post_id, text in zip(ids, texts)]
+    cached = cache.get_many(keys)
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in missing:
+            missing[key] = text
+    fresh = dict(zip(missing, _polarity_scores(list(missing.values()), workers, chunk_size)))
+    cache.put_many(fresh)
+    return [cached[key] if key in cached else fresh[key] for key in keys]
+
+def score_sentiments(texts, ids=None, cache=None, workers=None, chunk_size=None):
+    """
+    Scores many texts with the shared analyzer.
+
+    Args:
+        texts (list): Texts to score.
+        ids (list, optional): Post IDs aligned with texts, used in the cache key.
+        cache (SentimentCache, optional): Cache checked before scoring.
+        workers (int, optional): Overrides the configured number of worker processes.
+        chunk_size (int, optional): Overrides the configured chunk size.
+
+    Returns:
+        list: (label, compound) tuples in input order. Labels match get_sentiment_local.
+    """
+    results = []
+    for scores in polarity_scores_many(texts, ids=ids, cache=cache, workers=workers, chunk_size=chunk_size):
+        compound = scores['compound']
+        results.append((sentiment_label(compound), compound))
+    return results
 
 def preprocess_bitcoin_data(bitcoin_data, recent_dates=None):
     """
     Preprocesses Bitcoin price data.
     - If recent_dates is provided, filters for those dates.
     - Calculates daily Open, Close, and Range for the available/filtered dates.
+    - A PriceStore answers directly with per-day binary searches instead of a full scan.
     """
+    if isinstance(bitcoin_data, PriceStore):
+        bitcoin_agg = bitcoin_data.daily_ohlc(recent_dates)
+        if bitcoin_agg.empty:
+            raise ValueError("No Bitcoin data found for the required recent dates." if recent_dates else "No Bitcoin data found.")
+        return bitcoin_agg[['Date', 'Range', 'Open', 'Close']]
+
     if isinstance(bitcoin_data, list):
         bitcoin_df = pd.DataFrame(bitcoin_data)
     else:
@@ -53,21 +198,44 @@ def preprocess_bitcoin_data(bitcoin_data, recent_dates=None):
     
     return bitcoin_agg[['Date', 'Range', 'Open', 'Close']]
 
-def preprocess_reddit_only(reddit_data, num_recent_dates=2):
+def preprocess_reddit_only(reddit_data, num_recent_dates=2, start_date=None, end_date=None, sentiment_cache=None):
     """
     Preprocesses only the Reddit data.
     - Calculates sentiment and aggregates metrics for the specified number of recent dates.
     - Returns aggregated data and the list of recent dates used.
+    - When given a PostStore, reads only the partitions needed instead of refetching.
+    - When given a DailyAggregateIndex, looks the daily metrics up without rescoring.
 
     Args:
-        reddit_data (list or pd.DataFrame): Raw Reddit data.
+        reddit_data (list, pd.DataFrame, PostStore or DailyAggregateIndex): Raw Reddit data.
         num_recent_dates (int): The number of most recent dates to process. Defaults to 2.
+        start_date (datetime.date, optional): With a PostStore or index, first date to read.
+        end_date (datetime.date, optional): With a PostStore or index, last date to read.
+        sentiment_cache (SentimentCache, optional): Only posts missing from the cache are scored.
 
     Returns:
         tuple: (pd.DataFrame containing aggregated data, list of recent dates used)
                Returns (None, None) if processing fails due to insufficient data.
                Raises ValueError for other processing errors.
     """
+    if isinstance(reddit_data, DailyAggregateIndex):
+        if start_date is not None or end_date is not None:
+            dates = [d for d in reddit_data.dates()
+                     if (start_date is None or d >= start_date) and (end_date is None or d <= end_date)]
+            recent_dates = sorted(dates, reverse=True)
+        else:
+            recent_dates = reddit_data.recent_dates(num_recent_dates)
+        if len(recent_dates) < num_recent_dates:
+            print(f"Warning: Insufficient Reddit data - need posts from at least {num_recent_dates} different dates. Found {len(recent_dates)}.")
+            return None, None
+        return reddit_data.rows(recent_dates), recent_dates
+
+    if isinstance(reddit_data, PostStore):
+        if start_date is not None or end_date is not None:
+            reddit_data = reddit_data.read_range(start_date, end_date)
+        else:
+            reddit_data = reddit_data.read_recent_dates(num_recent_dates)
+
     if isinstance(reddit_data, list):
         reddit_df = pd.DataFrame(reddit_data)
     else:
@@ -104,9 +272,11 @@ def preprocess_reddit_only(reddit_data, num_recent_dates=2):
     recent_data['Title'] = recent_data['Title'].fillna('')
     recent_data['Text'] = recent_data['Text'].fillna('')
     
-    recent_data['Sentiment'] = recent_data.apply(
-        lambda row: get_sentiment_local(f"{row['Title']} {row['Text']}"),
-        axis=1
+    texts = [f"{title} {text}" for title, text in zip(recent_data['Title'], recent_data['Text'])]
+    ids = recent_data['ID'].tolist() if 'ID' in recent_data.columns else None
+    recent_data['Sentiment'] = pd.Categorical(
+        [label for label, _ in score_sentiments(texts, ids=ids, cache=sentiment_cache)],
+        categories=SENTIMENT_CLASSES
     )
 
     required_cols = ['Score', 'Comments', 'Upvote Ratio', 'ID', 'Sentiment']
@@ -119,29 +289,97 @@ def preprocess_reddit_only(reddit_data, num_recent_dates=2):
             else:
                  raise ValueError(f"Missing required column for aggregation: {col}")
 
-    agg_data = recent_data.groupby('Date').agg(
-        total_score=('Score', 'sum'),
-        total_comments=('Comments', 'sum'),
-        average_upvote_ratio=('Upvote Ratio', 'mean'),
-        total_posts=('ID', 'count'),
-        percentage_negative=('Sentiment', lambda x: (x == 'negative').mean() * 100),
-        percentage_neutral=('Sentiment', lambda x: (x == 'neutral').mean() * 100),
-        percentage_positive=('Sentiment', lambda x: (x == 'positive').mean() * 100)
-    ).reset_index()
+    agg_data = aggregate_daily(recent_data)
 
     return agg_data, recent_dates
 
 
-def preprocess_reddit_data(reddit_data, bitcoin_data):
+def update_daily_index(index, posts, sentiment_cache=None):
+    """
+    Scores posts and adds or updates them in a DailyAggregateIndex.
+
+    Args:
+        index (DailyAggregateIndex): Index to update.
+        posts (list): Post dicts in the /reddit endpoint format.
+        sentiment_cache (SentimentCache, optional): Only posts missing from the cache are scored.
+
+    Returns:
+        int: Number of posts indexed.
+    """
+    posts = [post for post in posts if post.get('id') and post.get('time')]
+    if not posts:
+        return 0
+    texts = [f"{post.get('title') or ''} {post.get('text') or ''}" for post in posts]
+    ids = [post['id'] for post in posts]
+    labels = [label for label, _ in score_sentiments(texts, ids=ids, cache=sentiment_cache)]
+    index.upsert_many(posts, labels)
+    return len(posts)
+
+
+def aggregate_daily(recent_data):
+    """
+    Aggregates scored posts into one row of metrics per Date.
+
+    Dates are factorized to integer group codes and sentiment is handled through its
+    integer category codes, so the class counts of every day come from a single
+    np.bincount and the remaining metrics from built-in groupby reductions on the
+    integer codes; no Python lambda runs per group. The result is identical to the
+    previous lambda-based groupby.
+
+    Args:
+        recent_data (pd.DataFrame): Posts with Date, Score, Comments, Upvote Ratio, ID
+            and a Sentiment column of labels (strings or SENTIMENT_CLASSES categories).
+
+    Returns:
+        pd.DataFrame: Date, total_score, total_comments, average_upvote_ratio, total_posts,
+            percentage_negative, percentage_neutral and percentage_positive.
+    """
+    group_codes, dates = pd.factorize(recent_data['Date'], sort=True)
+    num_days = len(dates)
+
+    sentiment = recent_data['Sentiment']
+    if not isinstance(sentiment.dtype, pd.CategoricalDtype) or list(sentiment.cat.categories) != SENTIMENT_CLASSES:
+        sentiment = pd.Series(pd.Categorical(sentiment, categories=SENTIMENT_CLASSES))
+    codes = sentiment.cat.codes.to_numpy().astype(np.int64)
+
+    posts_per_day = np.bincount(group_codes, minlength=num_days)
+    known = codes >= 0
+    class_counts = np.bincount(
+        group_codes[known] * len(SENTIMENT_CLASSES) + codes[known],
+        minlength=num_days * len(SENTIMENT_CLASSES)
+    ).reshape(num_days, len(SENTIMENT_CLASSES))
+
+    def daily_total(column):
+        values = recent_data[column].to_numpy()
+        if values.dtype.kind in 'iub':
+            # Integer sums are exact in float64 up to 2**53, so bincount matches groupby sum.
+            return np.bincount(group_codes, weights=values, minlength=num_days).astype(values.dtype)
+        return pd.Series(values).groupby(group_codes).sum().to_numpy()
+
+    agg_data = pd.DataFrame({
+        'Date': dates,
+        'total_score': daily_total('Score'),
+        'total_comments': daily_total('Comments'),
+        'average_upvote_ratio': pd.Series(recent_data['Upvote Ratio'].to_numpy()).groupby(group_codes).mean().to_numpy(),
+        'total_posts': np.bincount(group_codes, weights=recent_data['ID'].notna().to_numpy(), minlength=num_days).astype(np.int64),
+    })
+    for code, label in enumerate(SENTIMENT_CLASSES):
+        agg_data[f'percentage_{label}'] = class_counts[:, code] / posts_per_day * 100
+
+    return agg_data
+
+
+def preprocess_reddit_data(reddit_data, bitcoin_data, sentiment_cache=None, time_steps=2):
     """
     Preprocess Reddit and Bitcoin data by calling helper functions and merging.
     - Accepts lists of dictionaries (not file paths)
-    - Specifically requests 2 days of Reddit data for prediction compatibility.
+    - Requests `time_steps` days of Reddit data (2 by default), one per model time step.
+    - sentiment_cache (SentimentCache, optional) skips rescoring unchanged posts.
     """
     try:
-        agg_data, recent_dates = preprocess_reddit_only(reddit_data, num_recent_dates=2)
+        agg_data, recent_dates = preprocess_reddit_only(reddit_data, num_recent_dates=time_steps, sentiment_cache=sentiment_cache)
         if agg_data is None or recent_dates is None:
-             raise ValueError("Insufficient Reddit data - need posts from at least 2 different dates.")
+             raise ValueError(f"Insufficient Reddit data - need posts from at least {time_steps} different dates.")
     except ValueError as e:
         raise ValueError(f"Error processing Reddit data: {e}")
 
@@ -154,15 +392,19 @@ def preprocess_reddit_data(reddit_data, bitcoin_data):
     
     merged_data = merged_data.sort_values('Date', ascending=True)
 
-    if len(merged_data) < 2:
-        raise ValueError("Merge failed or insufficient overlapping data - need at least 2 days of complete data for both sources after merging.")
+    if len(merged_data) < time_steps:
+        raise ValueError(f"Merge failed or insufficient overlapping data - need at least {time_steps} days of complete data for both sources after merging.")
 
-    print("Preprocessed Merged Data (last 2 days):")
+    print(f"Preprocessed Merged Data (last {time_steps} days):")
     print(merged_data)
     return merged_data
 
-def predict_next_day(new_data, model, scaler, time_steps=2, features=None):
-    """Optimized prediction function"""
+def predict_next_day(new_data, model, scaler, time_steps=2, features=None, cache=None):
+    """
+    Optimized prediction function.
+    - cache (PredictionCache, optional) returns the stored prediction for an identical
+      feature window without running the scaler or the model.
+    """
     if 'Date' in new_data.columns:
         new_data_for_prediction = new_data.drop(columns=['Date'])
     else:
@@ -171,33 +413,104 @@ def predict_next_day(new_data, model, scaler, time_steps=2, features=None):
     if features:
         new_data_for_prediction = new_data_for_prediction[features]
     
-    scaled_data = scaler.transform(new_data_for_prediction)
-    
-    if len(scaled_data) < time_steps:
+    if len(new_data_for_prediction) < time_steps:
         raise ValueError(f"Need at least {time_steps} days of data")
-    
-    input_data = np.array([scaled_data[-time_steps:]])
+
+    window = new_data_for_prediction.iloc[-time_steps:]
+    if cache is not None:
+        key = cache.make_key(window.to_numpy(dtype=np.float64), window.columns, time_steps)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Only the last window is scored; it is a strided view, not a copy.
+    scaled_data = scaler.transform(window)
+    input_data = sliding_windows(scaled_data, time_steps)[-1:]
     probability = model.predict(input_data, verbose=0)[0][0]
     
-    return ('up' if probability > 0.5 else 'down'), float(probability)
+    result = ('up' if probability > 0.5 else 'down'), float(probability)
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+# File extension and media type of every supported export format.
+EXPORT_FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+}
+
+def write_dataframe(df, output, file_format='csv'):
+    """
+    Writes a DataFrame as CSV, Parquet or Arrow IPC.
+
+    Parquet and Arrow files are zstd-compressed and typed: Date columns become dates
+    and the 'time'/'date' string columns of raw data become timestamps.
+    Both need the optional pyarrow package.
+
+    Args:
+        df (pd.DataFrame): Data to write.
+        output (str or file-like): Destination path or binary buffer.
+        file_format (str): One of EXPORT_FORMATS. Defaults to 'csv'.
+
+    Raises:
+        ValueError: If the format is unknown or pyarrow is not installed.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    if file_format == 'csv':
+        if isinstance(output, str):
+            df.to_csv(output, index=False)
+        else:
+            output.write(df.to_csv(index=False).encode('utf-8'))
+        return
+
+    table = arrow_table(df, file_format)
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    if file_format == 'parquet':
+        pq.write_table(table, output, compression='zstd')
+    else:
+        feather.write_feather(table, output, compression='zstd')
 
-def export_preprocessed_data(reddit_data, bitcoin_data, output_filepath):
+def arrow_table(df, file_format='arrow'):
     """
-    Preprocesses Reddit and Bitcoin data and exports the result to a CSV file.
+    Converts a DataFrame to a typed pyarrow Table, as written by write_dataframe.
+
+    Raises:
+        ValueError: If pyarrow is not installed (`file_format` names the format that needed it).
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError(f"The {file_format} format requires the pyarrow package.")
+
+    typed = df.copy()
+    for column in ('time', 'date'):
+        if column in typed.columns and pd.api.types.is_string_dtype(typed[column]):
+            typed[column] = pd.to_datetime(typed[column], errors='coerce')
+    return pa.Table.from_pandas(typed, preserve_index=False)
+
+def export_preprocessed_data(reddit_data, bitcoin_data, output_filepath, sentiment_cache=None, time_steps=2, file_format='csv'):
+    """
+    Preprocesses Reddit and Bitcoin data and exports the result to a CSV, Parquet or Arrow file.
 
     Args:
-        reddit_data (list or pd.DataFrame): Raw Reddit data.
-        bitcoin_data (list or pd.DataFrame): Raw Bitcoin price data.
-        output_filepath (str): The path where the CSV file will be saved.
+        reddit_data (list, pd.DataFrame or PostStore): Raw Reddit data.
+        bitcoin_data (list, pd.DataFrame or PriceStore): Raw Bitcoin price data.
+        output_filepath (str): The path where the file will be saved.
+        sentiment_cache (SentimentCache, optional): Cache of per-post sentiment scores.
+        time_steps (int): Number of days to export. Defaults to 2.
+        file_format (str): One of EXPORT_FORMATS. Defaults to 'csv'.
     """
     try:
-        processed_data = preprocess_reddit_data(reddit_data, bitcoin_data)
+        processed_data = preprocess_reddit_data(reddit_data, bitcoin_data, sentiment_cache=sentiment_cache, time_steps=time_steps)
         
         output_dir = os.path.dirname(output_filepath)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        processed_data.to_csv(output_filepath, index=False)
+        write_dataframe(processed_data, output_filepath, file_format)
         print(f"Preprocessed data successfully exported to {output_filepath}")
     except ValueError as ve:
         print(f"Error during preprocessing: {ve}")
@@ -205,15 +518,16 @@ def export_preprocessed_data(reddit_data, bitcoin_data, output_filepath):
         print(f"An error occurred during export: {e}")
 
 
-def export_reddit_data(reddit_data, output_filepath, num_recent_dates=2):
+def export_reddit_data(reddit_data, output_filepath, num_recent_dates=2, file_format='csv'):
     """
     Preprocesses only the Reddit data for a specified number of recent dates
-    and exports the aggregated result to a CSV file.
+    and exports the aggregated result to a CSV, Parquet or Arrow file.
 
     Args:
         reddit_data (list or pd.DataFrame): Raw Reddit data.
-        output_filepath (str): The path where the CSV file will be saved.
+        output_filepath (str): The path where the file will be saved.
         num_recent_dates (int): The number of most recent dates to process. Defaults to 2.
+        file_format (str): One of EXPORT_FORMATS. Defaults to 'csv'.
 
     Returns:
         list: The recent dates used for aggregation, or None if export fails.
@@ -229,7 +543,7 @@ def export_reddit_data(reddit_data, output_filepath, num_recent_dates=2):
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        agg_data.to_csv(output_filepath, index=False)
+        write_dataframe(agg_data, output_filepath, file_format)
         print(f"Aggregated Reddit data ({len(recent_dates)} days) successfully exported to {output_filepath}")
         return recent_dates
     except ValueError as ve:
@@ -240,14 +554,15 @@ def export_reddit_data(reddit_data, output_filepath, num_recent_dates=2):
         return None
 
 
-def export_bitcoin_data(bitcoin_data, output_filepath, recent_dates=None):
+def export_bitcoin_data(bitcoin_data, output_filepath, recent_dates=None, file_format='csv'):
     """
     Preprocesses Bitcoin data (optionally filtered by recent_dates) and exports the result.
 
     Args:
-        bitcoin_data (list or pd.DataFrame): Raw Bitcoin price data.
-        output_filepath (str): The path where the CSV file will be saved.
+        bitcoin_data (list, pd.DataFrame or PriceStore): Raw Bitcoin price data.
+        output_filepath (str): The path where the file will be saved.
         recent_dates (list, optional): List of the 2 recent dates (datetime.date objects) to filter by. Defaults to None (process all data).
+        file_format (str): One of EXPORT_FORMATS. Defaults to 'csv'.
     """
     try:
         bitcoin_agg = preprocess_bitcoin_data(bitcoin_data, recent_dates=recent_dates) 
@@ -256,7 +571,7 @@ def export_bitcoin_data(bitcoin_data, output_filepath, recent_dates=None):
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        bitcoin_agg.to_csv(output_filepath, index=False)
+        write_dataframe(bitcoin_agg, output_filepath, file_format)
         print(f"Aggregated Bitcoin data successfully exported to {output_filepath}")
     except ValueError as ve:
         print(f"Error during Bitcoin data preprocessing/export: {ve}")
@@ -0,0 +1,76 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of model predictions keyed by the exact input window.
+
+    The key hashes the raw (unscaled) feature window together with the feature order,
+    the window length and `version`, which must identify the model and scaler. The
+    scaler is a fixed function of the raw window, so hashing before scaling keys the
+    same inputs as hashing the scaled window would, and a hit skips both
+    scaler.transform and model.predict.
+
+    Args:
+        version (str): Identifier of the model and scaler the cached predictions came from.
+        max_entries (int): Maximum number of cached predictions.
+    """
+
+    def __init__(self, version, max_entries=256):
+        self.version = version
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def make_key(self, window, features, time_steps):
+        """Builds the cache key of a raw feature window (rows x features)."""
+        digest = hashlib.sha1(np.ascontiguousarray(window, dtype=np.float64).tobytes())
+        digest.update(repr((list(features), time_steps, self.version)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns the cached (direction, probability) for `key`, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def metrics(self):
+        """Returns the counters, current size and hit ratio."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(
+                self.stats,
+                size=len(self._entries),
+                hit_ratio=self.stats["hits"] / lookups if lookups else None,
+            )
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def file_version(*paths):
+    """Returns a short content hash of the given files, used as a model/scaler version."""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
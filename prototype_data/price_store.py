@@ -0,0 +1,220 @@
+import datetime
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+DAY_MS = 24 * 60 * 60 * 1000
+HOUR_MS = 60 * 60 * 1000
+
+
+class PriceStore:
+    """
+    Append-only on-disk price series with binary-search range lookups.
+
+    Timestamps (int64 milliseconds, UTC) and prices (float64) are kept in two flat
+    binary files that only ever grow, and mirrored in memory as two parallel NumPy
+    arrays. Appends only accept points newer than the last stored one, so the
+    timestamp array is always sorted and doubles as its own index: every range or
+    per-day lookup is an `np.searchsorted` instead of a scan.
+
+    Points are stored at whatever granularity they were fetched: CoinGecko returns
+    hourly points for the initial `days=30` market_chart fetch but 5-minute points
+    for the short market_chart_range tail fetches. Appends keep every point, and
+    to_records and daily_ohlc downsample to the first point of each UTC hour when
+    reading, so /bitcoin and the daily features keep the hourly sampling the model
+    was trained on whatever the fetch granularity.
+
+    Args:
+        directory (str): Directory holding `timestamps.i8` and `prices.f8`. Created if missing.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.timestamps_path = os.path.join(directory, 'timestamps.i8')
+        self.prices_path = os.path.join(directory, 'prices.f8')
+        self._lock = threading.Lock()
+        self._append_lock = threading.Lock()
+
+        timestamps = _read_array(self.timestamps_path, np.int64)
+        prices = _read_array(self.prices_path, np.float64)
+        size = min(len(timestamps), len(prices))
+        if len(timestamps) != len(prices):
+            # An interrupted append can leave one file longer than the other.
+            print(f"Warning: price store files out of sync, truncating to {size} points.")
+            _truncate(self.timestamps_path, size, np.int64)
+            _truncate(self.prices_path, size, np.float64)
+
+        capacity = max(1024, size * 2)
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._prices = np.empty(capacity, dtype=np.float64)
+        self._timestamps[:size] = timestamps[:size]
+        self._prices[:size] = prices[:size]
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def arrays(self):
+        """
+        Returns consistent read-only (timestamps, prices) views of the stored series.
+
+        Views stay valid after later appends; they simply do not see the new points.
+        """
+        with self._lock:
+            timestamps = self._timestamps[:self._size]
+            prices = self._prices[:self._size]
+        timestamps.flags.writeable = False
+        prices.flags.writeable = False
+        return timestamps, prices
+
+    def last_timestamp(self):
+        """Returns the newest stored timestamp in milliseconds, or None if empty."""
+        timestamps, _ = self.arrays()
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def append(self, points):
+        """
+        Appends [timestamp_ms, price] pairs newer than the last stored point.
+
+        Args:
+            points (list or np.ndarray): Pairs as returned by CoinGecko's `prices` series.
+
+        Returns:
+            int: Number of points appended.
+        """
+        if len(points) == 0:
+            return 0
+        points = np.asarray(points, dtype=np.float64)
+        timestamps = points[:, 0].astype(np.int64)
+        prices = points[:, 1]
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, prices = timestamps[order], prices[order]
+
+        with self._append_lock:
+            last = self.last_timestamp()
+            if last is not None:
+                newer = timestamps > last
+                timestamps, prices = timestamps[newer], prices[newer]
+            # Drop duplicate timestamps within the batch, keeping the first.
+            keep = np.ones(len(timestamps), dtype=bool)
+            keep[1:] = timestamps[1:] != timestamps[:-1]
+            timestamps, prices = timestamps[keep], prices[keep]
+            if len(timestamps) == 0:
+                return 0
+
+            with open(self.timestamps_path, 'ab') as f:
+                timestamps.tofile(f)
+            with open(self.prices_path, 'ab') as f:
+                prices.tofile(f)
+
+            new_size = self._size + len(timestamps)
+            buffer_timestamps, buffer_prices = self._timestamps, self._prices
+            if new_size > len(buffer_timestamps):
+                capacity = max(new_size, len(buffer_timestamps) * 2)
+                buffer_timestamps = np.empty(capacity, dtype=np.int64)
+                buffer_prices = np.empty(capacity, dtype=np.float64)
+                buffer_timestamps[:self._size] = self._timestamps[:self._size]
+                buffer_prices[:self._size] = self._prices[:self._size]
+            # Slots past _size are invisible to readers, so they can be filled before publishing.
+            buffer_timestamps[self._size:new_size] = timestamps
+            buffer_prices[self._size:new_size] = prices
+            with self._lock:
+                self._timestamps, self._prices = buffer_timestamps, buffer_prices
+                self._size = new_size
+        return len(timestamps)
+
+    def range(self, start_ms=None, end_ms=None):
+        """
+        Returns (timestamps, prices) views for start_ms <= timestamp < end_ms.
+
+        Either bound may be None for an open-ended range.
+        """
+        timestamps, prices = self.arrays()
+        lo = 0 if start_ms is None else np.searchsorted(timestamps, start_ms, side='left')
+        hi = len(timestamps) if end_ms is None else np.searchsorted(timestamps, end_ms, side='left')
+        return timestamps[lo:hi], prices[lo:hi]
+
+    def hourly(self, start_ms=None, end_ms=None):
+        """Returns (timestamps, prices) in range, keeping only the first point of each UTC hour."""
+        return _first_per_hour(*self.range(start_ms, end_ms))
+
+    def to_records(self, start_ms=None, end_ms=None):
+        """Returns the hourly points in range as {"date", "price"} dicts, the /bitcoin endpoint format."""
+        timestamps, prices = self.hourly(start_ms, end_ms)
+        dates = pd.to_datetime(timestamps, unit='ms', utc=True).strftime("%Y-%m-%d %H:%M")
+        return [{"date": date, "price": float(price)} for date, price in zip(dates, prices)]
+
+    def daily_ohlc(self, dates=None):
+        """
+        Computes the daily Open/High/Low/Close for the given UTC dates.
+
+        Open and Close are the first and last hourly price of each day, matching
+        preprocess_bitcoin_data on the hourly /bitcoin records. Dates without any
+        price are left out.
+
+        Args:
+            dates (list, optional): datetime.date objects. Defaults to every stored day.
+
+        Returns:
+            pd.DataFrame: Columns Date, Range, Open, Close, High, Low, sorted by Date.
+        """
+        if dates is None:
+            timestamps, prices = self.hourly()
+            if len(timestamps) == 0:
+                starts = ends = np.empty(0, dtype=np.int64)
+                day_numbers = starts
+            else:
+                days = timestamps // DAY_MS
+                boundaries = np.flatnonzero(np.diff(days)) + 1
+                starts = np.concatenate(([0], boundaries))
+                ends = np.concatenate((boundaries, [len(timestamps)]))
+                day_numbers = days[starts]
+        else:
+            day_numbers = np.array(sorted({_day_number(date) for date in dates}), dtype=np.int64)
+            # Only the span covering the requested days is downsampled.
+            first_day = int(day_numbers[0]) if len(day_numbers) else 0
+            last_day = int(day_numbers[-1]) + 1 if len(day_numbers) else 0
+            timestamps, prices = self.hourly(first_day * DAY_MS, last_day * DAY_MS)
+            starts = np.searchsorted(timestamps, day_numbers * DAY_MS, side='left')
+            ends = np.searchsorted(timestamps, (day_numbers + 1) * DAY_MS, side='left')
+            present = ends > starts
+            day_numbers, starts, ends = day_numbers[present], starts[present], ends[present]
+
+        opens = prices[starts]
+        closes = prices[ends - 1]
+        highs = np.array([prices[lo:hi].max() for lo, hi in zip(starts, ends)], dtype=np.float64)
+        lows = np.array([prices[lo:hi].min() for lo, hi in zip(starts, ends)], dtype=np.float64)
+        return pd.DataFrame({
+            'Date': [datetime.date(1970, 1, 1) + datetime.timedelta(days=int(day)) for day in day_numbers],
+            'Range': closes - opens,
+            'Open': opens,
+            'Close': closes,
+            'High': highs,
+            'Low': lows,
+        })
+
+
+def _first_per_hour(timestamps, prices):
+    hours = timestamps // HOUR_MS
+    keep = np.ones(len(hours), dtype=bool)
+    keep[1:] = hours[1:] != hours[:-1]
+    return timestamps[keep], prices[keep]
+
+
+def _day_number(date):
+    return (date - datetime.date(1970, 1, 1)).days
+
+
+def _read_array(path, dtype):
+    if not os.path.exists(path):
+        return np.empty(0, dtype=dtype)
+    return np.fromfile(path, dtype=dtype)
+
+
+def _truncate(path, size, dtype):
+    if os.path.exists(path):
+        with open(path, 'r+b') as f:
+            f.truncate(size * np.dtype(dtype).itemsize)
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+
+class SentimentCache:
+    """
+    Durable, size-bounded cache of VADER scores keyed by post ID and content hash.
+
+    A post keeps its cached score until its title or text changes, because the key
+    includes a hash of the scored text. Entries live in an in-memory LRU backed by
+    an SQLite table, so scores survive restarts; both layers evict the least
+    recently used entries once they hold more than `max_entries`. The number of
+    persisted rows is counted once on open and then tracked on every write, so
+    writes never scan the table (one process per SQLite file is assumed).
+
+    Args:
+        path (str, optional): SQLite file for persistence. Memory-only if None.
+        max_entries (int): Maximum number of cached scores.
+    """
+
+    def __init__(self, path=None, max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._stored = 0
+        if path:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sentiment (
+                        key TEXT PRIMARY KEY,
+                        neg REAL,
+                        neu REAL,
+                        pos REAL,
+                        compound REAL,
+                        last_used REAL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_last_used ON sentiment(last_used)")
+                self._stored = conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def make_key(post_id, text):
+        """Builds the cache key for a post ID (or None for free text) and the text that gets scored."""
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return f"{post_id or ''}:{digest}"
+
+    def get_many(self, keys):
+        """
+        Looks up cached scores.
+
+        Returns:
+            dict: polarity_scores dicts keyed by cache key, for the keys that were found.
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                scores = self._memory.get(key)
+                if scores is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = scores
+
+        if missing and self.path:
+            now = time.time()
+            with closing(self._connect()) as conn, conn:
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    rows = conn.execute(
+                        f"SELECT key, neg, neu, pos, compound FROM sentiment WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for key, neg, neu, pos, compound in rows:
+                        found[key] = {'neg': neg, 'neu': neu, 'pos': pos, 'compound': compound}
+                    conn.executemany("UPDATE sentiment SET last_used = ? WHERE key = ?", [(now, row[0]) for row in rows])
+            with self._lock:
+                for key in missing:
+                    if key in found:
+                        self._remember(key, found[key])
+
+        with self._lock:
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries):
+        """
+        Stores scores.
+
+        Args:
+            entries (dict): polarity_scores dicts keyed by cache key.
+        """
+        if not entries:
+            return
+        with self._lock:
+            for key, scores in entries.items():
+                self._remember(key, scores)
+        if self.path:
+            now = time.time()
+            keys = list(entries)
+            with closing(self._connect()) as conn, conn:
+                existing = 0
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    existing += conn.execute(
+                        f"SELECT COUNT(*) FROM sentiment WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                    ).fetchone()[0]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment (key, neg, neu, pos, compound, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(key, s['neg'], s['neu'], s['pos'], s['compound'], now) for key, s in entries.items()]
+                )
+                with self._lock:
+                    self._stored += len(keys) - existing
+                    excess = self._stored - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM sentiment WHERE rowid IN (SELECT rowid FROM sentiment ORDER BY last_used LIMIT ?)", (excess,)
+                    )
+                    with self._lock:
+                        self._stored -= excess
+                        self.stats["evictions"] += excess
+
+    def __len__(self):
+        """Number of cached scores: persisted rows when backed by SQLite, else in-memory entries."""
+        return self._stored if self.path else len(self._memory)
+
+    def _remember(self, key, scores):
+        self._memory[key] = scores
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            if not self.path:
+                self.stats["evictions"] += 1
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.affine_scaler import AffineScaler
+
+PROTOTYPE_DIR = os.path.join(os.path.dirname(__file__), '..', 'prototype_data')
+
+
+def test_json_scaler_matches_sklearn():
+    joblib = pytest.importorskip("joblib")
+    pytest.importorskip("sklearn")
+    sklearn_scaler = joblib.load(os.path.join(PROTOTYPE_DIR, 'feature_scaler.pkl'))
+    scaler = AffineScaler.load(os.path.join(PROTOTYPE_DIR, 'feature_scaler.json'))
+    rows = pd.DataFrame(
+        np.random.default_rng(0).normal(scale=1000.0, size=(50, 8)),
+        columns=sklearn_scaler.feature_names_in_,
+    )
+    np.testing.assert_array_equal(scaler.transform(rows), sklearn_scaler.transform(rows))
+
+
+def test_transform_batches_of_windows():
+    scaler = AffineScaler([1.0, 2.0], [2.0, 4.0], ['a', 'b'])
+    windows = np.array([[[1.0, 2.0], [3.0, 6.0]], [[5.0, 10.0], [-1.0, -2.0]]])
+    np.testing.assert_array_equal(scaler.transform(windows), (windows - [1.0, 2.0]) / [2.0, 4.0])
+    with pytest.raises(ValueError):
+        scaler.transform(np.zeros((2, 3)))
@@ -36,6 +36,43 @@ def test_bitcoin_api_item_format(bitcoin_api_data):
         assert isinstance(item["price"], (float, int)), "Price should be a number"
 
 
+def test_bitcoin_api_compressed(bitcoin_api_data):
+    """Test that /bitcoin honours Accept-Encoding and still decodes to the same data."""
+    response = requests.get(f"{BASE_URL}/bitcoin", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert "Accept-Encoding" in response.headers.get("Vary", "")
+    assert response.json() == bitcoin_api_data
+
+
+def test_bitcoin_api_arrow_formats(bitcoin_api_data):
+    """Test that /bitcoin serves the Arrow file and stream formats under their own media types."""
+    pa = pytest.importorskip("pyarrow")
+    for media_type, open_reader in (
+        ("application/vnd.apache.arrow.file", pa.ipc.open_file),
+        ("application/vnd.apache.arrow.stream", pa.ipc.open_stream),
+    ):
+        response = requests.get(f"{BASE_URL}/bitcoin", headers={"Accept": media_type})
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == media_type
+        table = open_reader(pa.BufferReader(response.content)).read_all()
+        assert table.column("price").to_pylist() == [item["price"] for item in bitcoin_api_data]
+
+
+def test_bitcoin_api_conditional_get():
+    """Test that /bitcoin carries validators and answers a matching If-None-Match with 304."""
+    response = requests.get(f"{BASE_URL}/bitcoin")
+    assert response.status_code == 200
+    assert "max-age=" in response.headers.get("Cache-Control", "")
+    assert "Last-Modified" in response.headers
+    etag = response.headers["ETag"]
+
+    revalidated = requests.get(f"{BASE_URL}/bitcoin", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+
+
 # /reddit
 @pytest.fixture(scope="module")
 def reddit_api_data():
@@ -50,6 +87,20 @@ def reddit_api_data():
     return response.json()
 
 
+def test_sentiment_batch_api_ids(reddit_api_data):
+    """Test that /sentiment/batch scores stored posts by ID and reports unknown IDs."""
+    ids = [item["id"] for item in reddit_api_data]
+    response = requests.post(f"{BASE_URL}/sentiment/batch", json={"ids": ids + ["no-such-post"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["not_found"] == ["no-such-post"]
+    assert [item["id"] for item in data["results"]] == ids
+    for item, post in zip(data["results"], reddit_api_data):
+        single = requests.get(f"{BASE_URL}/sentiment", params={"text": f"{post['title'] or ''} {post['text'] or ''}"}).json()
+        assert item["result"] == single["result"]
+        assert item["compound"] == single["score"]["compound"]
+
+
 def test_reddit_api_returns_list(reddit_api_data):
     """Test that the /reddit endpoint returns a list."""
     assert isinstance(reddit_api_data, list), "Response should be a list"
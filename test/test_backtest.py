@@ -0,0 +1,72 @@
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.backtest import backtest, build_feature_history, sliding_windows
+from prototype_data.numpy_gru import NumpyGRUModel
+from prototype_data.predict import predict_next_day
+
+PROTOTYPE_DIR = os.path.join(os.path.dirname(__file__), '..', 'prototype_data')
+
+
+def test_sliding_windows_are_views():
+    values = np.arange(12, dtype=float).reshape(6, 2)
+    windows = sliding_windows(values, 3)
+    assert windows.shape == (4, 3, 2)
+    assert np.shares_memory(windows, values)
+    np.testing.assert_array_equal(windows[1], values[1:4])
+
+
+def test_backtest_matches_predict_next_day():
+    scaler = joblib.load(os.path.join(PROTOTYPE_DIR, 'feature_scaler.pkl'))
+    model = NumpyGRUModel(os.path.join(PROTOTYPE_DIR, 'btc_gru_model.h5'))
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame(
+        scaler.mean_ + rng.standard_normal((40, len(scaler.mean_))) * scaler.scale_,
+        columns=scaler.feature_names_in_,
+    )
+
+    summary, results = backtest(history, model, scaler, time_steps=2)
+
+    assert summary["windows"] == len(history) - 2
+    for i in (0, 17, len(results) - 1):
+        direction, probability = predict_next_day(history.iloc[:i + 2], model, scaler, time_steps=2)
+        assert results['predicted'][i] == direction
+        assert abs(results['probability'][i] - probability) < 1e-6
+    confusion = summary["confusion"]
+    hits = confusion["true_up"] + confusion["true_down"]
+    assert summary["hit_rate"] == hits / summary["windows"]
+    assert hits == int((results['predicted'] == results['actual']).sum())
+
+
+def test_backtest_skips_windows_across_missing_days():
+    scaler = joblib.load(os.path.join(PROTOTYPE_DIR, 'feature_scaler.pkl'))
+    model = NumpyGRUModel(os.path.join(PROTOTYPE_DIR, 'btc_gru_model.h5'))
+    dates = pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-05', '2025-01-06', '2025-01-07']).date
+    history = pd.DataFrame(
+        np.tile(scaler.mean_, (len(dates), 1)),
+        columns=scaler.feature_names_in_,
+    )
+    history.insert(0, 'Date', dates)
+
+    summary, results = backtest(history, model, scaler, time_steps=2)
+
+    # The windows targeting 01-05 and 01-06 span the missing 01-04.
+    assert summary["windows"] == 2
+    assert summary["skipped_windows"] == 2
+    assert [str(date) for date in results['Date']] == ['2025-01-03', '2025-01-07']
+
+
+def test_feature_history_drops_incomplete_day():
+    days = pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03']).date
+    reddit_rows = pd.DataFrame({'Date': days, 'total_score': [1, 2, 3]})
+    price_rows = pd.DataFrame({'Date': days, 'Range': [1.0, -1.0, 2.0]})
+
+    history = build_feature_history(reddit_rows, price_rows, complete_before=days[2])
+
+    assert list(history['Date']) == list(days[:2])
@@ -0,0 +1,55 @@
+import datetime
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.daily_index import DailyAggregateIndex
+from prototype_data.predict import preprocess_reddit_only, update_daily_index
+
+
+def make_post(post_id, day, hour, title, upvote, num_comments, upvote_ratio):
+    created = datetime.datetime(2025, 1, day, hour, tzinfo=datetime.timezone.utc)
+    return {
+        "id": post_id,
+        "title": title,
+        "text": "",
+        "upvote": upvote,
+        "num_comments": num_comments,
+        "upvote_ratio": upvote_ratio,
+        "time": created.strftime("%Y-%m-%d %H:%M:%S"),
+        "created_utc": created.timestamp(),
+    }
+
+
+def assert_matches_raw_aggregation(index, posts):
+    expected, _ = preprocess_reddit_only(posts, 3)
+    expected = expected.sort_values('Date', ignore_index=True)
+    pd.testing.assert_frame_equal(index.rows(), expected, check_dtype=False, rtol=1e-9)
+
+
+def test_index_matches_preprocess_reddit_only_through_updates():
+    posts = [
+        make_post("a", 1, 9, "Bitcoin is great, amazing gains", 10, 4, 0.9),
+        make_post("b", 1, 15, "Terrible crash, awful losses", 3, 7, 0.4),
+        make_post("c", 2, 8, "Bitcoin price today", 5, 1, 0.75),
+        make_post("d", 2, 20, "Love this rally", 12, 9, 0.95),
+        make_post("e", 3, 11, "Worst week ever", 1, 2, 0.3),
+        make_post("f", 3, 12, "Neutral update on fees", 4, 0, 0.6),
+    ]
+    index = DailyAggregateIndex()
+    update_daily_index(index, posts)
+    assert_matches_raw_aggregation(index, posts)
+
+    # An edited post is re-scored and its old contribution replaced.
+    edited = dict(posts[1], title="Great recovery, happy holders", upvote=30, num_comments=11, upvote_ratio=0.85)
+    posts[1] = edited
+    update_daily_index(index, [edited])
+    assert len(index) == len(posts)
+    assert_matches_raw_aggregation(index, posts)
+
+    index.remove("f")
+    posts = [post for post in posts if post["id"] != "f"]
+    assert_matches_raw_aggregation(index, posts)
@@ -0,0 +1,76 @@
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from export_files import ExportCache, csv_chunks, etag_matches, prune_directory
+from prototype_data.predict import write_dataframe
+
+
+def test_csv_chunks_match_to_csv():
+    df = pd.DataFrame({"date": ["2025-01-01"] * 2500, "price": [i / 3 for i in range(2500)]})
+    assert b"".join(csv_chunks(df, chunk_rows=1000)).decode('utf-8') == df.to_csv(index=False)
+
+
+def test_prune_directory_by_age_and_size(tmp_path):
+    now = time.time()
+    for name, age in (("old.csv", 7200), ("mid.csv", 60), ("new.csv", 0)):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (now - age, now - age))
+
+    assert prune_directory(str(tmp_path), max_age=3600, max_bytes=150) == 2
+    assert sorted(os.listdir(tmp_path)) == ["new.csv"]
+
+
+def test_columnar_exports_are_typed():
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"date": ["2025-01-01 00:00:00", "2025-01-01 01:00:00"], "price": [1.5, 2.5]})
+    for file_format, read in (("parquet", pd.read_parquet), ("arrow", pd.read_feather)):
+        buffer = io.BytesIO()
+        write_dataframe(df, buffer, file_format)
+        result = read(io.BytesIO(buffer.getvalue()))
+        assert pd.api.types.is_datetime64_any_dtype(result["date"])
+        assert result["price"].tolist() == [1.5, 2.5]
+
+
+def test_export_cache_serves_rendered_file(tmp_path):
+    cache = ExportCache(str(tmp_path), max_age=3600, max_bytes=1 << 20)
+    df = pd.DataFrame({"date": ["2025-01-01"], "price": [1.5]})
+    key = ExportCache.make_key("v1", "bitcoin", format="csv")
+
+    assert cache.get(key, "csv") is None
+    path, etag = cache.put(key, df, "csv")
+    assert cache.get(key, "csv") == (path, etag)
+    assert open(path).read() == df.to_csv(index=False)
+    assert ExportCache.make_key("v2", "bitcoin", format="csv") != key
+    assert etag_matches(f'W/"{etag}", "other"', etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_export_cache_never_prunes_files_in_use(tmp_path):
+    cache = ExportCache(str(tmp_path), max_age=3600, max_bytes=10)
+    df = pd.DataFrame({"price": [i / 3 for i in range(100)]})
+
+    # Larger than max_bytes: kept until released.
+    first, _ = cache.put("first", df, "csv")
+    assert os.path.exists(first)
+    # Another render prunes while `first` is still being served.
+    second, _ = cache.put("second", df, "csv")
+    assert os.path.exists(first) and os.path.exists(second)
+    assert cache.get("first", "csv")[0] == first
+
+    cache.release(first)
+    cache.prune()
+    assert os.path.exists(first)
+    cache.release(first)
+    cache.release(second)
+    cache.prune()
+    assert os.listdir(tmp_path) == []
+    assert cache.metrics()["in_use"] == 0
@@ -0,0 +1,67 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from inference_batcher import InferenceBatcher
+
+
+class SumModel:
+    """Returns the sum of every window and records the size of each forward pass."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, x, verbose=0):
+        self.calls.append(len(x))
+        return x.sum(axis=(1, 2))[:, None]
+
+
+def test_concurrent_predictions_are_batched():
+    model = SumModel()
+    batcher = InferenceBatcher(model, max_batch_size=8, max_wait=0.05)
+    inputs = np.arange(20 * 2 * 3, dtype=float).reshape(20, 2, 3)
+    outputs = [None] * len(inputs)
+
+    def predict(i):
+        outputs[i] = batcher.predict(inputs[i:i + 1])
+
+    threads = [threading.Thread(target=predict, args=(i,)) for i in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.shutdown()
+
+    np.testing.assert_array_equal(np.concatenate(outputs), model.predict(inputs))
+    assert max(model.calls[:-1]) <= 8
+    assert len(model.calls) - 1 < len(inputs)
+    metrics = batcher.metrics()
+    assert metrics["requests"] == len(inputs)
+    assert sum(int(size) * count for size, count in metrics["batch_sizes"].items()) == len(inputs)
+
+
+def test_predictions_racing_shutdown_never_hang():
+    model = SumModel()
+    batcher = InferenceBatcher(model, max_batch_size=4, max_wait=0.01)
+    inputs = np.ones((1, 2, 3))
+    outcomes = []
+
+    def predict():
+        outcomes.append(float(batcher.predict(inputs)[0, 0]))
+
+    threads = [threading.Thread(target=predict) for _ in range(50)]
+    for thread in threads[:25]:
+        thread.start()
+    batcher.shutdown()
+    for thread in threads[25:]:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    # Requests queued before shutdown are served by the worker, later ones directly.
+    assert outcomes == [6.0] * 50
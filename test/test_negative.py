@@ -40,6 +40,19 @@ def test_sentiment_api_score_invalid_input():
     assert response.json()["result"] == "neutral"
 
 
+def test_sentiment_batch_api_invalid_input():
+    """Test that /sentiment/batch rejects requests without exactly one of texts or ids."""
+    response = requests.post(f"{BASE_URL}/sentiment/batch", json={})
+    assert response.status_code == 422
+
+    response = requests.post(f"{BASE_URL}/sentiment/batch", json={"texts": ["a"], "ids": ["b"]})
+    assert response.status_code == 422
+
+    response = requests.post(f"{BASE_URL}/sentiment/batch", json={"texts": []})
+    assert response.status_code == 200
+    assert response.json()["results"] == []
+
+
 def test_api_sentiment_excute_button_show_error(page: Page):
     wait_page_loading(page)
 
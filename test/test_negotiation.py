@@ -0,0 +1,119 @@
+import datetime
+import io
+import os
+import sys
+from email.utils import format_datetime
+
+import pytest
+from starlette.requests import Request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from negotiation import (ARROW_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE, JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE,
+                         _choose, _parse_quality, cache_headers, negotiated_response, not_modified)
+
+AVAILABLE = [JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ARROW_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE]
+FETCHED_AT = datetime.datetime(2025, 1, 1, 12, 30, tzinfo=datetime.timezone.utc)
+RECORDS = [{"Date": "2025-01-01", "Close": 1.5}, {"Date": "2025-01-02", "Close": 2.5}]
+
+
+def make_request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def choose(accept):
+    return _choose(_parse_quality(accept), AVAILABLE, JSON_MEDIA_TYPE)
+
+
+def test_parse_quality_orders_by_q_then_position():
+    parsed = _parse_quality("text/html;q=0.5, application/msgpack, */*;q=0.1, application/json;q=bad, APPLICATION/X-Y")
+    assert parsed == [
+        ("application/msgpack", 1.0),
+        ("application/x-y", 1.0),
+        ("text/html", 0.5),
+        ("*/*", 0.1),
+        ("application/json", 0.0),
+    ]
+    assert _parse_quality("") == []
+
+
+def test_choose_honours_q_values_and_wildcards():
+    assert choose("") == JSON_MEDIA_TYPE
+    assert choose("application/msgpack;q=0.5, application/vnd.apache.arrow.stream") == ARROW_STREAM_MEDIA_TYPE
+    assert choose("application/x-msgpack") == MSGPACK_MEDIA_TYPE
+    # Wildcards fall back to the default, unknown types are skipped.
+    assert choose("text/html, */*;q=0.8") == JSON_MEDIA_TYPE
+    assert choose("application/*") == JSON_MEDIA_TYPE
+    assert _choose(_parse_quality("*"), ["br", "gzip"], None) == "br"
+    assert _choose(_parse_quality("identity"), ["br", "gzip"], None) is None
+    # q=0 means "not acceptable", even for an otherwise preferred type.
+    assert choose("application/vnd.apache.arrow.file;q=0, application/msgpack;q=0.2") == MSGPACK_MEDIA_TYPE
+    assert _choose(_parse_quality("gzip;q=0"), ["gzip"], None) is None
+
+
+def test_arrow_file_and_stream_use_their_own_media_types():
+    pa = pytest.importorskip("pyarrow")
+    file_response = negotiated_response(make_request(accept=ARROW_MEDIA_TYPE), RECORDS)
+    assert file_response.media_type == ARROW_MEDIA_TYPE
+    assert file_response.body.startswith(b"ARROW1")
+    table = pa.ipc.open_file(io.BytesIO(file_response.body)).read_all()
+    assert table.column("Close").to_pylist() == [1.5, 2.5]
+
+    stream_response = negotiated_response(make_request(accept=ARROW_STREAM_MEDIA_TYPE), RECORDS)
+    assert stream_response.media_type == ARROW_STREAM_MEDIA_TYPE
+    assert not stream_response.body.startswith(b"ARROW1")
+    table = pa.ipc.open_stream(stream_response.body).read_all()
+    assert table.column("Close").to_pylist() == [1.5, 2.5]
+    assert stream_response.headers["Vary"] == "Accept, Accept-Encoding"
+
+
+def test_weak_and_strong_etags_match():
+    headers = {"ETag": 'W/"abc123"'}
+    assert not_modified(make_request(if_none_match='W/"abc123"'), headers).status_code == 304
+    assert not_modified(make_request(if_none_match='"abc123"'), headers).status_code == 304
+    assert not_modified(make_request(if_none_match='"other", W/"abc123"'), headers).status_code == 304
+    assert not_modified(make_request(if_none_match='"other"'), headers) is None
+    # A strong ETag must not lose its first characters.
+    assert not_modified(make_request(if_none_match='"abc123"'), {"ETag": '"abc123"'}).status_code == 304
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = cache_headers("v2", last_modified=FETCHED_AT)
+    # The date alone would say "not modified", but the entity tag is outdated.
+    request = make_request(if_none_match='W/"v1"', if_modified_since=format_datetime(FETCHED_AT, usegmt=True))
+    assert not_modified(request, headers) is None
+    request = make_request(if_none_match='W/"v2"', if_modified_since="Wed, 01 Jan 2020 00:00:00 GMT")
+    assert not_modified(request, headers).status_code == 304
+
+
+def test_if_modified_since_against_last_modified():
+    headers = cache_headers("v1", last_modified=FETCHED_AT)
+    assert headers["Last-Modified"] == "Wed, 01 Jan 2025 12:30:00 GMT"
+
+    same = make_request(if_modified_since=headers["Last-Modified"])
+    later = make_request(if_modified_since="Thu, 02 Jan 2025 00:00:00 GMT")
+    earlier = make_request(if_modified_since="Tue, 31 Dec 2024 00:00:00 GMT")
+    response = not_modified(same, headers)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert response.headers["Vary"] == "Accept, Accept-Encoding"
+    assert not_modified(later, headers).status_code == 304
+    assert not_modified(earlier, headers) is None
+    assert not_modified(make_request(if_modified_since="not a date"), headers) is None
+    # Without Last-Modified, a date alone never validates.
+    assert not_modified(same, cache_headers("v1")) is None
+
+
+def test_cache_headers_max_age():
+    assert cache_headers("v1")["Cache-Control"] == "public, max-age=0"
+    assert "Last-Modified" not in cache_headers("v1")
+    assert cache_headers("v1", max_age=299.7)["Cache-Control"] == "public, max-age=299"
+    headers = cache_headers("v1", max_age=42, stale_while_revalidate=600)
+    assert headers["Cache-Control"] == "public, max-age=42, stale-while-revalidate=600"
+    assert headers["ETag"] == 'W/"v1"'
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.numpy_gru import NumpyGRUModel, load_guarded_model
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'prototype_data', 'btc_gru_model.h5')
+
+
+def test_numpy_gru_output_shape_and_range():
+    model = NumpyGRUModel(MODEL_PATH)
+    probabilities = model.predict(np.zeros((3, 2, 8)), verbose=0)
+    assert probabilities.shape == (3, 1)
+    assert np.all((probabilities > 0) & (probabilities < 1))
+
+
+def test_numpy_gru_matches_keras():
+    keras_models = pytest.importorskip("tensorflow.keras.models")
+    inputs = np.random.default_rng(0).normal(scale=2.0, size=(256, 2, 8)).astype(np.float32)
+    expected = keras_models.load_model(MODEL_PATH).predict(inputs, verbose=0)
+    actual = NumpyGRUModel(MODEL_PATH).predict(inputs, verbose=0)
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+
+def test_reduced_precision_guard():
+    model, report = load_guarded_model(MODEL_PATH, precision='int8', max_error=0.01)
+    assert report["active_precision"] == "int8"
+    assert report["direction_flips"] == 0
+    assert model.nbytes < NumpyGRUModel(MODEL_PATH).nbytes
+
+    model, report = load_guarded_model(MODEL_PATH, precision='float16', max_error=1e-9)
+    assert report["active_precision"] == "float32"
+    assert model.precision == "float32"
+
+
+def test_guard_skips_non_finite_reference_windows():
+    windows = np.random.default_rng(0).normal(size=(64, 2, 8))
+    windows[:10, 1, 3] = np.nan
+    windows[10, 0, 0] = np.inf
+    model, report = load_guarded_model(MODEL_PATH, precision='float16', max_error=0.01,
+                                       reference_inputs=windows, reference_name='feature history')
+    assert report["dropped_reference_windows"] == 11
+    assert report["reference_windows"] == 53
+    assert report["reference_inputs"] == "feature history"
+    assert report["active_precision"] == "float16"
+    assert np.isfinite(report["max_abs_error"])
+
+    # Nothing usable left: fall back to the synthetic windows.
+    _, report = load_guarded_model(MODEL_PATH, precision='float16', reference_inputs=windows[:10])
+    assert report["reference_inputs"] == "synthetic"
+
+
+def test_guard_fails_closed_on_non_finite_error(monkeypatch):
+    def broken_predict(self, x, verbose=0):
+        return np.full((len(x), 1), np.nan) if self.precision != 'float32' else original(self, x, verbose)
+
+    original = NumpyGRUModel.predict
+    monkeypatch.setattr(NumpyGRUModel, 'predict', broken_predict)
+    model, report = load_guarded_model(MODEL_PATH, precision='int8', max_error=0.01)
+    assert report["active_precision"] == "float32"
+    assert report["max_abs_error"] is None
+    assert model.precision == "float32"
@@ -0,0 +1,72 @@
+import datetime
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.post_store import PostStore
+
+
+def make_post(post_id, day, hour, title="Bitcoin", text=""):
+    created = datetime.datetime(2025, 1, day, hour, tzinfo=datetime.timezone.utc)
+    return {
+        "id": post_id,
+        "time": created.strftime("%Y-%m-%d %H:%M:%S"),
+        "url": f"https://reddit.com/{post_id}",
+        "title": title,
+        "upvote": 1,
+        "num_comments": 0,
+        "text": text,
+        "upvote_ratio": 0.5,
+    }
+
+
+def ids(posts):
+    return [post["id"] for post in posts]
+
+
+def test_upsert_updates_posts_in_place(tmp_path):
+    store = PostStore(str(tmp_path / "posts.sqlite3"))
+    assert store.upsert([make_post("a", 1, 9), make_post("b", 1, 12)]) == 2
+
+    edited = dict(make_post("a", 1, 9, title="Bitcoin (edited)", text="updated"), upvote=7)
+    store.upsert([edited])
+
+    assert store.count() == 2
+    stored = store.get_many(["a"])["a"]
+    assert stored["title"] == "Bitcoin (edited)"
+    assert stored["text"] == "updated"
+    assert stored["upvote"] == 7
+    assert stored["time"] == edited["time"]
+
+
+def test_date_range_reads(tmp_path):
+    store = PostStore(str(tmp_path / "posts.sqlite3"))
+    store.upsert([
+        make_post("a", 1, 0), make_post("b", 1, 23), make_post("c", 2, 12),
+        make_post("d", 3, 8), make_post("e", 5, 18),
+    ])
+
+    # Bounds are inclusive UTC dates, results newest first.
+    assert ids(store.read_range(datetime.date(2025, 1, 1), datetime.date(2025, 1, 2))) == ["c", "b", "a"]
+    assert ids(store.read_range("2025-01-03")) == ["e", "d"]
+    assert ids(store.read_range(end_date="2025-01-01")) == ["b", "a"]
+    assert ids(store.read_range("2025-01-04", "2025-01-04")) == []
+
+    assert store.recent_dates(2) == [datetime.date(2025, 1, 5), datetime.date(2025, 1, 3)]
+    assert ids(store.read_recent_dates(2)) == ["e", "d"]
+    assert ids(store.latest(2)) == ["e", "d"]
+    created = datetime.datetime(2025, 1, 5, 18, tzinfo=datetime.timezone.utc).timestamp()
+    assert store.newest_created_utc() == created
+
+
+def test_get_many_skips_unknown_ids(tmp_path):
+    store = PostStore(str(tmp_path / "posts.sqlite3"))
+    store.upsert([make_post(f"p{i}", 1 + i % 28, 6) for i in range(600)])
+
+    # More IDs than one lookup chunk.
+    found = store.get_many([f"p{i}" for i in range(600)] + ["missing"])
+    assert len(found) == 600
+    assert "missing" not in found
+    assert found["p42"]["url"] == "https://reddit.com/p42"
+    assert store.get_many([]) == {}
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.prediction_cache import PredictionCache, file_version
+
+FEATURES = ['Compound_Score', 'Range', 'Open', 'Close']
+
+
+def window(seed):
+    return np.random.default_rng(seed).normal(size=(3, len(FEATURES)))
+
+
+def test_identical_window_hits():
+    cache = PredictionCache("v1")
+    cache.put(cache.make_key(window(0), FEATURES, 3), ("up", 0.7))
+
+    # A copy with a different dtype and layout still hashes to the same key.
+    same = np.asfortranarray(window(0).astype(np.float64))
+    assert cache.get(cache.make_key(same, FEATURES, 3)) == ("up", 0.7)
+    assert cache.get(cache.make_key(window(1), FEATURES, 3)) is None
+    assert cache.get(cache.make_key(window(0), FEATURES[::-1], 3)) is None
+
+
+def test_model_version_change_misses(tmp_path):
+    model = tmp_path / "model.h5"
+    model.write_bytes(b"weights v1")
+    old = PredictionCache(file_version(str(model)))
+    key = old.make_key(window(0), FEATURES, 3)
+    old.put(key, ("up", 0.7))
+
+    model.write_bytes(b"weights v2")
+    new = PredictionCache(file_version(str(model)))
+    assert new.version != old.version
+    assert new.make_key(window(0), FEATURES, 3) != key
+    # Even an entry left over from the old model is not served under the new version.
+    old.version = new.version
+    assert old.get(old.make_key(window(0), FEATURES, 3)) is None
+
+
+def test_lru_eviction_and_hit_ratio():
+    cache = PredictionCache("v1", max_entries=2)
+    assert cache.metrics()["hit_ratio"] is None
+    keys = [cache.make_key(window(seed), FEATURES, 3) for seed in range(3)]
+    cache.put(keys[0], ("up", 0.6))
+    cache.put(keys[1], ("down", 0.4))
+    assert cache.get(keys[0]) == ("up", 0.6)
+    cache.put(keys[2], ("up", 0.8))
+
+    # keys[1] was least recently used.
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == ("up", 0.6)
+    assert cache.get(keys[2]) == ("up", 0.8)
+    metrics = cache.metrics()
+    assert metrics["size"] == 2 and metrics["evictions"] == 1
+    assert metrics["hits"] == 3 and metrics["misses"] == 1
+    assert metrics["hit_ratio"] == 0.75
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from price_client import PriceClient
+
+
+class StandInCoinGecko(BaseHTTPRequestHandler):
+    """Minimal stand-in for the CoinGecko market_chart endpoint."""
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        if self.path.startswith("/coins/bitcoin/market_chart"):
+            status, body = 200, {"prices": [[1714521600000, 60000.0], [1714525200000, 60100.5]]}
+        else:
+            status, body = 404, {"error": "not found"}
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    """
+    Fixture that runs the stand-in price server on a free local port.
+
+    Returns:
+        str: Base URL of the running server.
+    """
+    StandInCoinGecko.delay = 0.0
+    StandInCoinGecko.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInCoinGecko)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_price_client_market_chart(stand_in_server):
+    """Test that market_chart returns the prices series from the source."""
+    async def run():
+        client = PriceClient(base_url=stand_in_server)
+        try:
+            return await client.market_chart("bitcoin", "usd", 30)
+        finally:
+            await client.aclose()
+
+    prices = asyncio.run(run())
+    assert prices == [[1714521600000, 60000.0], [1714525200000, 60100.5]]
+
+
+def test_price_client_error_status(stand_in_server):
+    """Test that a non-2xx answer raises instead of returning data."""
+    async def run():
+        client = PriceClient(base_url=stand_in_server)
+        try:
+            await client.market_chart("dogecoin", "usd", 30)
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+
+def test_price_client_timeout(stand_in_server):
+    """Test that a slow source is cut off by the per-call timeout."""
+    StandInCoinGecko.delay = 0.5
+
+    async def run():
+        client = PriceClient(base_url=stand_in_server)
+        try:
+            await client.market_chart("bitcoin", "usd", 30, timeout=0.1)
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(run())
+
+
+def test_price_client_bounded_concurrency(stand_in_server):
+    """Test that no more than max_concurrency requests reach the source at once."""
+    StandInCoinGecko.delay = 0.05
+
+    async def run():
+        client = PriceClient(base_url=stand_in_server, max_concurrency=2)
+        try:
+            return await asyncio.gather(*[client.market_chart() for _ in range(6)])
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(run())
+    assert len(results) == 6
+    assert StandInCoinGecko.max_in_flight <= 2
@@ -0,0 +1,91 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.predict import preprocess_bitcoin_data
+from prototype_data.price_store import DAY_MS, PriceStore
+
+START_MS = 1735689600000  # 2025-01-01 00:00 UTC
+
+
+def test_append_keeps_only_newer_points(tmp_path):
+    store = PriceStore(str(tmp_path))
+    assert store.append([[START_MS, 1.0], [START_MS + 2000, 2.0]]) == 2
+
+    # Points older than or equal to the last stored one are dropped, the rest appended in order.
+    assert store.append([[START_MS + 3000, 3.0], [START_MS + 2000, 9.0], [START_MS + 1000, 9.0]]) == 1
+    # Duplicate timestamps within a batch keep the first point.
+    assert store.append([[START_MS + 4000, 4.0], [START_MS + 4000, 5.0]]) == 1
+    assert store.append([]) == 0
+
+    timestamps, prices = store.arrays()
+    np.testing.assert_array_equal(timestamps, START_MS + np.array([0, 2000, 3000, 4000]))
+    np.testing.assert_array_equal(prices, [1.0, 2.0, 3.0, 4.0])
+    assert store.last_timestamp() == START_MS + 4000
+
+
+def test_reopen_restores_and_repairs_files(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append([[START_MS + i * 1000, float(i)] for i in range(5)])
+
+    reopened = PriceStore(str(tmp_path))
+    np.testing.assert_array_equal(reopened.arrays()[0], store.arrays()[0])
+    np.testing.assert_array_equal(reopened.arrays()[1], store.arrays()[1])
+
+    # Simulate an append interrupted after the timestamps were written.
+    with open(reopened.timestamps_path, 'ab') as f:
+        np.array([START_MS + 9000], dtype=np.int64).tofile(f)
+    repaired = PriceStore(str(tmp_path))
+    assert len(repaired) == 5
+    assert os.path.getsize(repaired.timestamps_path) == 5 * 8
+    assert os.path.getsize(repaired.prices_path) == 5 * 8
+    assert repaired.append([[START_MS + 9000, 9.0]]) == 1
+    assert len(PriceStore(str(tmp_path))) == 6
+
+
+def test_daily_ohlc_matches_preprocess_bitcoin_data(tmp_path):
+    rng = np.random.default_rng(0)
+    # Three days of hourly points followed by five-minute points, as the tail fetches return.
+    timestamps = list(START_MS + np.arange(72) * 3600 * 1000)
+    timestamps += list(START_MS + 3 * DAY_MS + np.arange(100) * 300 * 1000)
+    points = [[t, 60000 + float(p)] for t, p in zip(timestamps, rng.normal(0, 500, len(timestamps)))]
+    store = PriceStore(str(tmp_path))
+    store.append(points)
+
+    records = store.to_records()
+    dates = [datetime.date(2025, 1, 2), datetime.date(2025, 1, 4), datetime.date(2025, 1, 9)]
+    expected = preprocess_bitcoin_data(records, recent_dates=dates).reset_index(drop=True)
+    result = store.daily_ohlc(dates)[['Date', 'Range', 'Open', 'Close']]
+    pd.testing.assert_frame_equal(result, expected)
+
+    everything = preprocess_bitcoin_data(records).reset_index(drop=True)
+    pd.testing.assert_frame_equal(store.daily_ohlc()[['Date', 'Range', 'Open', 'Close']], everything)
+
+
+def test_reads_are_hourly_whatever_the_fetch_granularity(tmp_path):
+    rng = np.random.default_rng(1)
+    # One price every five minutes for four days; the hourly series is every twelfth point.
+    five_minutes = START_MS + np.arange(4 * 24 * 12) * 300 * 1000
+    prices = 60000 + rng.normal(0, 500, len(five_minutes))
+    hourly_points = [[t, p] for t, p in zip(five_minutes[::12], prices[::12])]
+
+    hourly_store = PriceStore(str(tmp_path / 'hourly'))
+    hourly_store.append(hourly_points)
+    # Initial hourly fetch for two days, then 5-minute tail fetches.
+    mixed_store = PriceStore(str(tmp_path / 'mixed'))
+    mixed_store.append(hourly_points[:48])
+    split = 48 * 12
+    mixed_store.append([[t, p] for t, p in zip(five_minutes[split:split + 300], prices[split:split + 300])])
+    mixed_store.append([[t, p] for t, p in zip(five_minutes[split + 300:], prices[split + 300:])])
+
+    assert len(mixed_store) > len(hourly_store)
+    assert mixed_store.to_records() == hourly_store.to_records()
+    assert len(mixed_store.to_records()) == 4 * 24
+    pd.testing.assert_frame_equal(mixed_store.daily_ohlc(), hourly_store.daily_ohlc())
+    dates = [datetime.date(2025, 1, 3), datetime.date(2025, 1, 4)]
+    pd.testing.assert_frame_equal(mixed_store.daily_ohlc(dates), hourly_store.daily_ohlc(dates))
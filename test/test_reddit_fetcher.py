@@ -0,0 +1,127 @@
+import asyncio
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from reddit_fetcher import FetchQueueFull, RedditFetcher
+
+
+def submission(number):
+    return SimpleNamespace(
+        id=f"p{number}", created_utc=1735689600 + number * 60, url="u", title=f"post {number}",
+        score=number, num_comments=0, selftext="", upvote_ratio=1.0,
+    )
+
+
+class FakeReddit:
+    """Serves r/bitcoin/new from a list of submissions, newest first, counting what was read."""
+
+    def __init__(self, count):
+        self.submissions = [submission(number) for number in range(count, 0, -1)]
+        self.read = 0
+
+    def post(self, number):
+        self.submissions.insert(0, submission(number))
+
+    def subreddit(self, name):
+        return self
+
+    def new(self, limit=None):
+        for item in self.submissions:
+            self.read += 1
+            yield item
+
+
+def make_fetcher(reddit, **kwargs):
+    fetcher = RedditFetcher("id", "secret", "agent", **kwargs)
+    fetcher._reddit = lambda: reddit
+    return fetcher
+
+
+def ids(posts):
+    return [post["id"] for post in posts]
+
+
+def test_full_queue_rejects_fetches():
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    fetcher = RedditFetcher("id", "secret", "agent", max_workers=1, max_queue=1, incremental=False)
+
+    def blocking_crawl(limit):
+        started.release()
+        release.wait(timeout=5)
+        return [{"id": "p1"}]
+
+    fetcher._crawl = blocking_crawl
+
+    async def run():
+        running = asyncio.ensure_future(fetcher.fetch(1))
+        queued = asyncio.ensure_future(fetcher.fetch(1))
+        await asyncio.get_running_loop().run_in_executor(None, started.acquire)
+        with pytest.raises(FetchQueueFull):
+            await fetcher.fetch(1)
+        metrics = fetcher.metrics()
+        release.set()
+        return metrics, await running, await queued
+
+    metrics, first, second = asyncio.run(run())
+    fetcher.shutdown()
+    assert metrics["rejected"] == 1
+    assert metrics["running"] == 1 and metrics["queue_depth"] == 1
+    assert first == second == [{"id": "p1"}]
+    assert fetcher.metrics()["completed"] == 2
+
+
+def test_incremental_fetch_merges_only_new_posts():
+    reddit = FakeReddit(10)
+    fetcher = make_fetcher(reddit)
+
+    assert ids(asyncio.run(fetcher.fetch(5))) == ["p10", "p9", "p8", "p7", "p6"]
+    reddit.post(11)
+    reddit.post(12)
+    reddit.read = 0
+
+    posts = asyncio.run(fetcher.fetch(5))
+    fetcher.shutdown()
+
+    assert ids(posts) == ["p12", "p11", "p10", "p9", "p8"]
+    # Paging stopped at the first known post.
+    assert reddit.read == 3
+    metrics = fetcher.metrics()
+    assert metrics["full_crawls"] == 1 and metrics["incremental_crawls"] == 1
+    assert metrics["last_new_posts"] == 2
+
+
+def test_seeded_fetcher_starts_incremental():
+    reddit = FakeReddit(8)
+    fetcher = make_fetcher(reddit)
+    stored = [{"id": f"p{number}"} for number in range(6, 0, -1)]
+    fetcher.seed(stored, submission(6).created_utc)
+
+    posts = asyncio.run(fetcher.fetch(6))
+    fetcher.shutdown()
+
+    assert ids(posts) == ["p8", "p7", "p6", "p5", "p4", "p3"]
+    assert len(set(ids(posts))) == len(posts)
+    assert fetcher.metrics()["full_crawls"] == 0
+
+
+def test_full_crawl_fallbacks():
+    reddit = FakeReddit(10)
+    fetcher = make_fetcher(reddit, full_refresh_interval=0)
+    asyncio.run(fetcher.fetch(5))
+    asyncio.run(fetcher.fetch(5))
+    # The refresh interval has always elapsed, so every fetch is a full crawl.
+    assert fetcher.metrics()["full_crawls"] == 2
+
+    fetcher = make_fetcher(reddit)
+    asyncio.run(fetcher.fetch(5))
+    # A limit larger than the window cannot be served incrementally.
+    assert len(asyncio.run(fetcher.fetch(8))) == 8
+    assert fetcher.metrics()["full_crawls"] == 2
+    assert fetcher.metrics()["incremental_crawls"] == 0
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from result_scheduler import PredictionScheduler
+from snapshot_cache import Snapshot
+
+
+def test_on_demand_scheduler_follows_new_snapshots():
+    snapshots = [Snapshot([{"id": "a"}], []), Snapshot([{"id": "a"}], []), Snapshot([{"id": "b"}], [])]
+    computed = []
+
+    async def get_snapshot():
+        return snapshots[0]
+
+    async def compute(snapshot):
+        computed.append(snapshot.version)
+        return {"posts": len(computed)}
+
+    async def run():
+        scheduler = PredictionScheduler(get_snapshot, compute, interval=0)
+        first = await scheduler.get()
+        snapshots.pop(0)
+        assert await scheduler.get() == first
+        snapshots.pop(0)
+        return first, await scheduler.get()
+
+    first, latest = asyncio.run(run())
+    assert first["posts"] == 1
+    assert latest["posts"] == 2
+    assert len(computed) == 2 and computed[0] != computed[1]
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.predict import polarity_scores_many, score_sentiments, sentiment_label, shutdown_sentiment_pool
+
+TEXTS = [
+    "Bitcoin is going to the moon, great gains!",
+    "Terrible crash today, I lost everything.",
+    "BTC price is 60000.",
+    "",
+    "Not bad, but not great either.",
+    "HODL!!! Best investment ever :)",
+    "Scam coins everywhere, awful market.",
+]
+
+
+def test_parallel_scores_match_serial():
+    texts = TEXTS * 3
+    serial = polarity_scores_many(texts, workers=1)
+    try:
+        parallel = polarity_scores_many(texts, workers=2, chunk_size=4)
+    finally:
+        shutdown_sentiment_pool()
+    assert parallel == serial
+
+
+def test_score_sentiments_labels_known_texts():
+    results = score_sentiments(TEXTS)
+    assert [label for label, _ in results] == [
+        'positive', 'negative', 'neutral', 'neutral', 'negative', 'positive', 'negative',
+    ]
+    assert results[2][1] == 0.0
+    assert results[0][1] > 0.05 and results[1][1] < -0.05
+
+
+def test_sentiment_label_thresholds():
+    assert sentiment_label(0.05) == 'neutral'
+    assert sentiment_label(-0.05) == 'neutral'
+    assert sentiment_label(0.0) == 'neutral'
+    assert sentiment_label(0.0501) == 'positive'
+    assert sentiment_label(-0.0501) == 'negative'
+    assert sentiment_label(1.0) == 'positive'
+    assert sentiment_label(-1.0) == 'negative'
@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prototype_data.sentiment_cache import SentimentCache
+
+
+def scores(compound):
+    return {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': compound}
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = SentimentCache(max_entries=2)
+    cache.put_many({"a": scores(0.1), "b": scores(0.2)})
+    assert cache.get_many(["a"]) == {"a": scores(0.1)}
+    cache.put_many({"c": scores(0.3)})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": scores(0.1), "c": scores(0.3)}
+    assert cache.stats["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_scores_persist_across_reopen_within_bound(tmp_path):
+    path = str(tmp_path / "sentiment.sqlite3")
+    cache = SentimentCache(path, max_entries=3)
+    cache.put_many({"a": scores(0.1), "b": scores(0.2)})
+    cache.put_many({"b": scores(0.25), "c": scores(0.3)})
+    assert len(cache) == 3
+    cache.put_many({"d": scores(0.4)})
+    assert len(cache) == 3
+    assert cache.stats["evictions"] == 1
+
+    reopened = SentimentCache(path, max_entries=3)
+    assert len(reopened) == 3
+    found = reopened.get_many(["a", "b", "c", "d"])
+    assert found == {"b": scores(0.25), "c": scores(0.3), "d": scores(0.4)}
+
+
+def test_edited_post_misses_the_cache():
+    cache = SentimentCache()
+    original = SentimentCache.make_key("post1", "Bitcoin to the moon")
+    cache.put_many({original: scores(0.5)})
+
+    assert cache.get_many([original]) == {original: scores(0.5)}
+    edited = SentimentCache.make_key("post1", "Bitcoin crashed")
+    assert edited != original
+    assert cache.get_many([edited]) == {}
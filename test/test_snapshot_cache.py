@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'fast-api')))
+
+from snapshot_cache import Snapshot, SnapshotCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingLoader:
+    """Returns a new snapshot per call, optionally holding each load until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        return Snapshot([{"id": f"load{self.calls}"}], [])
+
+
+def test_snapshot_expires_after_ttl():
+    clock, loader = Clock(), CountingLoader()
+    cache = SnapshotCache(loader, ttl=60, stale_ttl=0, clock=clock)
+
+    async def run():
+        first = await cache.get()
+        clock.now += 59
+        assert await cache.get() is first
+        assert cache.freshness() == 1
+        clock.now += 1
+        return first, await cache.get()
+
+    first, second = asyncio.run(run())
+    assert first.reddit == [{"id": "load1"}]
+    assert second.reddit == [{"id": "load2"}]
+    assert loader.calls == 2
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+
+def test_stale_snapshot_is_served_while_revalidating():
+    clock, loader = Clock(), CountingLoader()
+    cache = SnapshotCache(loader, ttl=60, stale_ttl=120, clock=clock)
+
+    async def run():
+        first = await cache.get()
+        clock.now += 90
+        loader.release = asyncio.Event()
+        # Both callers get the stale snapshot at once and share one background refresh.
+        stale = [await cache.get(), await cache.get()]
+        await asyncio.sleep(0)
+        assert loader.calls == 2
+        loader.release.set()
+        await cache.refresh()
+        return first, stale, await cache.get()
+
+    first, stale, fresh = asyncio.run(run())
+    assert stale == [first, first]
+    assert fresh.reddit == [{"id": "load2"}]
+    assert cache.stats["stale_hits"] == 2
+    assert cache.stats["loads"] == 2
+
+    # Past ttl + stale_ttl the caller waits for a new load instead.
+    clock.now += 181
+    assert asyncio.run(cache.get()).reddit == [{"id": "load3"}]
+
+
+def test_concurrent_misses_share_one_load():
+    loader = CountingLoader()
+    cache = SnapshotCache(loader, clock=Clock())
+
+    async def run():
+        loader.release = asyncio.Event()
+        waiting = [asyncio.ensure_future(cache.get()) for _ in range(10)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        return await asyncio.gather(*waiting)
+
+    results = asyncio.run(run())
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats["misses"] == 10 and cache.stats["loads"] == 1